@@ -1,72 +1,33 @@
 import socket
-import json
+import collections
+import functools
+import hashlib
+import itertools
+import logging
+import os
+import random
+import signal
 import struct
-import datetime
-import decimal
+import queue
+import threading
 import time
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from django.conf import settings
 from django.db import connection
 from vehicles.models import Vehicle
 from data_reported.models import ReportedData
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+logger = logging.getLogger(__name__)
+parser_logger = logging.getLogger("gps_listener.parser")  # per-record AVL decoding detail
 
 # Activity codes mapping based on Teltonika FMB120 Event IDs and LATRA specifications
 ACTIVITY_CODES = {
     # Default/Common events
     0: "No Event",
-    1: "Movement/Logging (Default)",
-    
-    # LATRA Standard Activity IDs
-    2: "Engine ON",
-    3: "Engine OFF", 
-    4: "Speeding",
-    5: "Hash Braking",
-    6: "Hash Turning", 
-    7: "Hash Acceleration",
-    8: "Panic Button (Driver)",
-    9: "Internal Battery Low",
-    10: "External Power Disconnected",
-    11: "Excessive Idle",
-    12: "Accident",
-    13: "Panic Button (Passenger)",
-    14: "Device Tempering",
-    15: "Black Box Data Logging",
-    16: "Fuel data report",
-    17: "Invalid Scan",
-    18: "Engine Start",
-    19: "Engine Stop", 
-    20: "Enter Boundary",
-    21: "Leave Boundary",
-    22: "Enter Checkpoint",
-    23: "Leave Checkpoint",
-    24: "Ibutton Scan (Regular)",
-    25: "GPS Antenna Disconnected",
-    26: "GPS Signal Lost",
-    27: "GPS Signal Restored",
-    28: "Main Power Disconnected",
-    29: "Main Power Connected",
-    30: "Emergency Button",
-    31: "Driver Identification",
-    32: "Unauthorized Driver",
-    33: "Vehicle Theft",
-    34: "Maintenance Alert",
-    35: "Service Reminder",
-    36: "Low Fuel Alert",
-    37: "High Temperature Alert",
-    38: "Low Temperature Alert",
-    39: "Door Open",
-    40: "Door Close",
-    41: "Hood Open",
-    42: "Hood Close",
-    43: "Trunk Open",
-    44: "Trunk Close",
-    45: "Seatbelt Unfastened",
-    46: "Seatbelt Fastened",
-    47: "Airbag Deployed",
-    48: "Collision Detected",
-    49: "Rollover Detected",
-    50: "Emergency Call",
     
     # Teltonika Eventual I/O elements (Event IDs) mapped to LATRA activities
     155: "20",  # Geofence zone 01 -> Enter/Leave Boundary
@@ -78,26 +39,12 @@ ACTIVITY_CODES = {
     62: "20",   # Geofence zone 07 -> Enter/Leave Boundary
     63: "20",   # Geofence zone 08 -> Enter/Leave Boundary
     64: "20",   # Geofence zone 09 -> Enter/Leave Boundary
-    65: "20",   # Geofence zone 10 -> Enter/Leave Boundary
     70: "20",   # Geofence zone 11 -> Enter/Leave Boundary
-    88: "20",   # Geofence zone 12 -> Enter/Leave Boundary
-    91: "20",   # Geofence zone 13 -> Enter/Leave Boundary
-    92: "20",   # Geofence zone 14 -> Enter/Leave Boundary
-    93: "20",   # Geofence zone 15 -> Enter/Leave Boundary
-    94: "20",   # Geofence zone 16 -> Enter/Leave Boundary
-    95: "20",   # Geofence zone 17 -> Enter/Leave Boundary
-    96: "20",   # Geofence zone 18 -> Enter/Leave Boundary
-    97: "20",   # Geofence zone 19 -> Enter/Leave Boundary
-    98: "20",   # Geofence zone 20 -> Enter/Leave Boundary
-    99: "20",   # Geofence zone 21 -> Enter/Leave Boundary
     
     250: "18",  # Trip Start -> Engine Start (when state=1) / Trip Stop -> Engine Stop (when state=0)
-    251: "11",  # Idling Start/Stop -> Excessive Idle
-    252: "9",   # Battery Unplug -> Internal Battery Low
     253: "5",   # Green Driving Event (harsh braking) -> Hash Braking
     254: "7",   # Green Driving Value (harsh acceleration) -> Hash Acceleration
     255: "4",   # Over Speeding -> Speeding
-    246: "33",  # Towing Detection -> Vehicle Theft
     247: "12",  # Crash Detection -> Accident
     248: "24",  # Immobilizer -> Ibutton Scan (Regular)
     249: "26",  # Jamming -> GPS Signal Lost
@@ -107,7 +54,6 @@ ACTIVITY_CODES = {
     240: "1",   # Movement Event -> Movement/Logging (Default)
     
     # Additional Teltonika Event IDs mapped to LATRA activities
-    175: "20",  # Auto Geofence -> Enter/Leave Boundary
     236: "8",   # Alarm -> Panic Button (Driver)
     257: "12",  # Crash trace data -> Accident
     285: "31",  # Blood alcohol content -> Driver Identification
@@ -116,12 +62,6 @@ ACTIVITY_CODES = {
     449: "2",   # Ignition On Counter -> Engine ON
     
     # System events that should generate activities
-    1: "1",     # System event 1 -> Movement/Logging
-    2: "1",     # System event 2 -> Movement/Logging
-    3: "1",     # System event 3 -> Movement/Logging
-    4: "1",     # System event 4 -> Movement/Logging
-    5: "1",     # System event 5 -> Movement/Logging
-    6: "1",     # System event 6 -> Movement/Logging
     7: "1",     # System event 7 -> Movement/Logging
     8: "1",     # System event 8 -> Movement/Logging
     
@@ -144,10 +84,6 @@ ACTIVITY_CODES = {
     1: "39",    # Digital Input 1 -> Door Open/Close
     2: "39",    # Digital Input 2 -> Door Open/Close  
     3: "39",    # Digital Input 3 -> Door Open/Close
-    179: "39",  # Digital Output 1 -> Door Open/Close
-    180: "39",  # Digital Output 2 -> Door Open/Close
-    380: "39",  # Digital Output 3 -> Door Open/Close
-    381: "14",  # Ground Sense -> Device Tempering
     
     # Fuel and Engine Monitoring
     12: "16",   # Fuel Used GPS -> Fuel data report
@@ -174,16 +110,12 @@ ACTIVITY_CODES = {
     17: "7",    # Axis X (harsh acceleration) -> Hash Acceleration
     18: "6",    # Axis Y (harsh turning) -> Hash Turning
     19: "5",    # Axis Z (harsh braking) -> Hash Braking
-    383: "15",  # AXL Calibration Status -> Black Box Data Logging
     
     # Trip and Odometer
     199: "15",  # Trip Odometer -> Black Box Data Logging
     16: "15",   # Total Odometer -> Black Box Data Logging (removed from transmission but tracked)
     
     # RFID and Access Control
-    207: "24",  # RFID -> Ibutton Scan (Regular)
-    78: "24",   # iButton -> Ibutton Scan (Regular)
-    264: "24",  # Barcode ID -> Ibutton Scan (Regular)
     
     # Environmental Sensors
     10: "15",   # SD Status -> Black Box Data Logging
@@ -201,14 +133,6 @@ ACTIVITY_CODES = {
     623: "15",  # Frequency DIN2 -> Black Box Data Logging
     
     # Extended Sensor Network (EYE Sensors)
-    10800: "37", # EYE Temperature 1 (high temp) -> High Temperature Alert
-    10801: "37", # EYE Temperature 2 (high temp) -> High Temperature Alert
-    10802: "37", # EYE Temperature 3 (high temp) -> High Temperature Alert
-    10803: "37", # EYE Temperature 4 (high temp) -> High Temperature Alert
-    10820: "9",  # EYE Low Battery 1 -> Internal Battery Low
-    10821: "9",  # EYE Low Battery 2 -> Internal Battery Low
-    10822: "9",  # EYE Low Battery 3 -> Internal Battery Low
-    10823: "9",  # EYE Low Battery 4 -> Internal Battery Low
     10812: "1",  # EYE Movement 1 -> Movement/Logging
     10813: "1",  # EYE Movement 2 -> Movement/Logging
     10814: "1",  # EYE Movement 3 -> Movement/Logging
@@ -222,26 +146,16 @@ ACTIVITY_CODES = {
     284: "15",  # Driving Records -> Black Box Data Logging
     
     # Driver Card Events
-    403: "31",  # Driver Name -> Driver Identification
-    404: "31",  # Driver card license type -> Driver Identification
-    405: "31",  # Driver Gender -> Driver Identification
-    406: "31",  # Driver Card ID -> Driver Identification
-    407: "31",  # Driver card expiration date -> Driver Identification
-    408: "31",  # Driver Card place of issue -> Driver Identification
-    409: "31",  # Driver Status Event -> Driver Identification
     
     # OBD Events
     256: "16",  # VIN -> Fuel data report
-    30: "34",   # Number of DTC -> Maintenance Alert
     281: "34",  # Fault Codes -> Maintenance Alert
     
     # CAN Adapter Events
-    90: "39",   # Door Status -> Door Open/Close
     235: "34",  # Oil Level -> Maintenance Alert
     160: "34",  # DTC Faults -> Maintenance Alert
     
     # BLE Sensor Events
-    385: "22",  # Beacon -> Enter/Leave Checkpoint
     548: "22",  # Advanced BLE Beacon data -> Enter/Leave Checkpoint
     
     # COMPREHENSIVE I/O PARAMETER MAPPING - Complete coverage of Teltonika FMB130
@@ -272,7 +186,6 @@ ACTIVITY_CODES = {
     97: "15",   # CAN Engine Oil Temperature -> Black Box Data Logging
     98: "37",   # CAN Engine Coolant Temperature -> High Temperature Alert
     99: "15",   # CAN Brake Application Pressure -> Black Box Data Logging
-    100: "15",  # CAN Engine Retarder -> Black Box Data Logging
     
     # Complete OBD-II Parameter Coverage
     30: "15",   # OBD Engine RPM -> Black Box Data Logging
@@ -305,7 +218,6 @@ ACTIVITY_CODES = {
     202: "16",  # Fuel Level 2 -> Fuel data report
     203: "16",  # Fuel Used 1 -> Fuel data report
     204: "16",  # Fuel Used 2 -> Fuel data report
-    207: "16",  # Fuel Rate 1 -> Fuel data report
     208: "16",  # Fuel Rate 2 -> Fuel data report
     209: "16",  # Fuel Consumption GPS -> Fuel data report
     210: "16",  # Fuel Tank Capacity -> Fuel data report
@@ -332,7 +244,6 @@ ACTIVITY_CODES = {
     78: "24",   # iButton ID -> Ibutton Scan (Regular)  
     207: "24",  # RFID Tag -> Ibutton Scan (Regular)
     264: "24",  # Barcode ID -> Ibutton Scan (Regular)
-    100: "24",  # Magnetic Card ID -> Ibutton Scan (Regular)
     
     # Complete Geofence Zone Coverage (155-231 comprehensive)
     161: "20",  # Geofence Zone 04 Enter -> Enter Boundary
@@ -453,6 +364,134 @@ ACTIVITY_CODES = {
     1010: "9",  # Critical Battery Level -> Internal Battery Low
 }
 
+# ACTIVITY_CODES normalised once: Teltonika event/I/O id -> LATRA activity id (int)
+EVENT_TO_LATRA_ID = {
+    code: int(activity) for code, activity in ACTIVITY_CODES.items()
+    if isinstance(activity, str) and activity.isdigit()
+}
+
+# LATRA activity names by activity id
+LATRA_ACTIVITY_NAMES = {
+    1: "Movement/Logging", 2: "Engine ON", 3: "Engine OFF",
+    4: "Speeding", 5: "Hash Braking", 6: "Hash Turning", 7: "Hash Acceleration",
+    8: "Panic Button (Driver)", 9: "Internal Battery Low", 10: "External Power Disconnected",
+    11: "Excessive Idle", 12: "Accident", 13: "Panic Button (Passenger)",
+    14: "Device Tempering", 15: "Black Box Data Logging", 16: "Fuel data report",
+    17: "Invalid Scan", 18: "Engine Start", 19: "Engine Stop",
+    20: "Enter Boundary", 21: "Leave Boundary", 22: "Enter Checkpoint",
+    23: "Leave Checkpoint", 24: "Ibutton Scan (Regular)", 25: "Reserved",
+    26: "GPS Signal Lost", 27: "GPS Signal Restored", 28: "Reserved",
+    29: "Reserved", 30: "Reserved", 31: "Driver Identification",
+    32: "Reserved", 33: "Vehicle Theft", 34: "Maintenance Alert",
+    35: "Reserved", 36: "Low Fuel Alert", 37: "High Temperature Alert",
+    38: "Reserved", 39: "Door Open/Close", 40: "Reserved",
+}
+
+# Upper-cased I/O 78 (iButton) readings that mean "no key presented"
+NO_IBUTTON_IDS = frozenset({"0", "0X0000000000000000"})
+# I/O 245 (driver ID) also reports all ones when no card is present
+NO_DRIVER_IDS = NO_IBUTTON_IDS | {"FFFFFFFFFFFFFFFF"}
+
+# Digital inputs/outputs reported as Door Open/Close
+DIGITAL_INPUT_IOS = frozenset({1, 2, 3, 379})
+DIGITAL_OUTPUT_IOS = frozenset({179, 180, 380})
+
+# I/O ids with a dedicated fallback check in codec_8e_parser_bin
+FALLBACK_DETECTION_IOS = frozenset({67, 66, 250, 78, 245, 200})
+
+# Fixed-width I/O groups in AVL record order (value size in bytes)
+IO_VALUE_SIZES = (1, 2, 4, 8)
+
+# Binary AVL packet layout (all fields big-endian)
+# Header: preamble, data field length, codec id, number of records
+AVL_PACKET_HEADER = struct.Struct(">IIBB")
+# Record: timestamp, priority, longitude, latitude, altitude, angle, satellites, speed,
+# event IO id, total IO count (the last two are 1 byte in Codec 8, 2 bytes in Codec 8E)
+AVL_RECORD_HEADERS = {
+    0x08: struct.Struct(">QBiiHHBHBB"),
+    0x8E: struct.Struct(">QBiiHHBHHH"),
+}
+AVL_COUNT_STRUCTS = {
+    0x08: struct.Struct(">B"),
+    0x8E: struct.Struct(">H"),
+}
+# (I/O id, value) pairs for the 1, 2, 4 and 8 byte groups
+AVL_IO_STRUCTS = {
+    0x08: tuple(struct.Struct(f">B{value_format}") for value_format in "BHIQ"),
+    0x8E: tuple(struct.Struct(f">H{value_format}") for value_format in "BHIQ"),
+}
+# Codec 8E variable-length element: I/O id, value length
+AVL_XIO_HEADER = struct.Struct(">HH")
+
+# I/O element decoding tables used by GPSListener.sorting_hat
+# Plain unsigned integers
+IO_PARSE_INT = frozenset({
+    1, 2, 3, 9, 10, 11, 16, 21, 24, 69, 80, 179, 180, 200, 205, 206,
+    239, 240, 250, 251, 252, 253, 254, 255, 256, 299,
+})
+
+# Unsigned integers with a fixed scale, stored as the divisor: true division
+# of an int is correctly rounded, so n / 10 == float(Decimal(n) * Decimal('0.1'))
+IO_PARSE_SCALED = {
+    241: 10,
+    242: 10,
+    181: 10,
+    182: 10,
+    66: 100,
+    67: 100,
+    13: 100,
+    68: 1000,
+    12: 1000,
+    6: 1000,
+}
+
+# Signed 32-bit values (accelerometer axes)
+IO_PARSE_SIGNED32 = frozenset({17, 18, 19})
+
+# Kept as the raw hex string (driver identification)
+IO_PARSE_RAW_HEX = frozenset({245})
+
+# addon_info fields as (I/O id, LATRA key) pairs per activity
+ENGINE_OFF_ADDON_FIELDS = (
+    (239, "distance_travelled"),
+    (80, "trip_duration"),
+    (241, "avgSpeed"),
+    (242, "maxSpeed"),
+)
+POWER_ADDON_FIELDS = (
+    (67, "ext_power_voltage"),
+    (66, "int_battery_voltage"),
+)
+ACTIVITY_ADDON_FIELDS = {
+    2: ((11, "idleTime"),),             # Engine ON / Trip Start
+    3: ENGINE_OFF_ADDON_FIELDS,         # Engine OFF
+    9: POWER_ADDON_FIELDS,              # Internal Battery Low
+    10: POWER_ADDON_FIELDS,             # External Power Disconnected
+}
+
+# LATRA activities that don't require valid GPS coordinates (panic, battery, power, device events, etc.)
+NON_GPS_ACTIVITIES = frozenset({8, 9, 10, 14, 15, 16, 17, 24, 26, 31, 34})
+
+# Position sent to LATRA when a record has no usable GPS fix (Nairobi), preformatted
+FALLBACK_LATITUDE = f"{-1.286389:.6f}"
+FALLBACK_LONGITUDE = f"{36.817223:.6f}"
+
+# I/O ids feeding the LATRA GSM/GPS quality fields (HDOP, d2d3, RSSI, LAC, Cell_ID, MCC)
+GSM_FIELD_IOS = frozenset({182, 181, 21, 212, 213, 14})
+
+# fuel_info fields for the fuel data report (16) as (I/O id, LATRA key) pairs
+FUEL_INFO_FIELDS = (
+    (250, "validFlag"),     # Data valid flag
+    (251, "signalLevel"),   # Signal sensitivity
+    (252, "softStatus"),    # Software status
+    (253, "hardFault"),     # Hardware fault code
+    (16, "fuelLevel"),      # Fuel level (smoothed)
+    (254, "rtFuelLevel"),   # Real-time fuel level
+    (255, "tankTemp"),      # Tank temperature (already multiplied by 10)
+    (256, "channel"),       # Fuel tank compartment
+)
+FUEL_INFO_IOS = frozenset(io_id for io_id, _ in FUEL_INFO_FIELDS)
+
 # Hardware fault codes for activity 16
 HARDWARE_FAULT_CODES = {
     0: "Normal",
@@ -462,70 +501,538 @@ HARDWARE_FAULT_CODES = {
     4: "Sensor Configuration Error"
 }
 
+# Per-activity detail blocks for display_activity_specific_data ({rec[...]}: record, {io[...]}: I/O)
+ENGINE_OFF_DETAIL_TEMPLATE = (
+    "ENGINE OFF EVENT DETAILS:\n"
+    "Event Time: {rec[timestamp]}\n"
+    "Location: {rec[latitude]}, {rec[longitude]}\n"
+    "Speed at shutdown: {rec[speed]} km/h\n"
+    "Distance travelled: {io[239]} km\n"
+    "Trip duration: {io[80]} minutes\n"
+    "Average speed: {io[241]} km/h\n"
+    "Max speed: {io[242]} km/h\n"
+    "GPS Satellites: {rec[satellites]}\n"
+    "Engine Hours: {io[80]}\n"
+    "Fuel Level: {io[16]}%\n"
+    "Battery Voltage: {io[66]}V"
+)
+ENGINE_ON_DETAIL_TEMPLATE = (
+    "ENGINE ON EVENT DETAILS:\n"
+    "Idle Time: {io[11]} seconds\n"
+    "Driver ID: {io[245]}"
+)
+POWER_DETAIL_TEMPLATE = (
+    "POWER EVENT DETAILS:\n"
+    "External Power Voltage: {io[67]}V\n"
+    "Internal Battery Voltage: {io[66]}V"
+)
+DRIVER_DETAIL_TEMPLATE = (
+    "DRIVER IDENTIFICATION DETAILS:\n"
+    "Driver ID (16-digit hex): {driver_id}"
+)
+FUEL_DETAIL_TEMPLATE = (
+    "FUEL DATA REPORT DETAILS:\n"
+    "Data Valid Flag: {io[250]} (0=valid)\n"
+    "Signal Sensitivity: {io[251]}/99\n"
+    "Software Status: {io[252]} (0=normal)\n"
+    "Hardware Fault: {hw_fault_code} - {hw_fault_desc}\n"
+    "Fuel Level (smoothed): {io[16]} mm\n"
+    "Real-time Fuel Level: {io[254]} mm\n"
+    "Tank Temperature: {temp_celsius}°C\n"
+    "Fuel Tank Compartment: {channel}"
+)
+ACTIVITY_DETAIL_TEMPLATES = {
+    3: ENGINE_OFF_DETAIL_TEMPLATE,
+    2: ENGINE_ON_DETAIL_TEMPLATE,
+    9: POWER_DETAIL_TEMPLATE,
+    10: POWER_DETAIL_TEMPLATE,
+    17: DRIVER_DETAIL_TEMPLATE,
+    24: DRIVER_DETAIL_TEMPLATE,
+    16: FUEL_DETAIL_TEMPLATE,
+}
+
+class _DetailFields(dict):
+    """Template lookup that renders missing fields as N/A"""
+    def __missing__(self, key):
+        return "N/A"
+
+def _raw_to_volts(raw):
+    """Normalise a raw voltage reading to volts (devices report mV, 10mV or V)"""
+    if raw > 1000:  # Likely in mV
+        return raw / 1000.0
+    if raw > 100:  # Likely in 10mV units
+        return raw / 100.0
+    return float(raw)  # Already in V
+
+# Threads per pool for device connections and packet processing
+WORKER_COUNT = min(32, (os.cpu_count() or 1) * 4)
+
+# Per-connection receive buffer (a Codec 8E packet is at most ~1.3 KB)
+RECV_BUFFER_SIZE = 8192
+
+# Most vehicles kept in the IMEI -> Vehicle cache
+VEHICLE_CACHE_SIZE = 10000
+# Seconds an IMEI with no registered vehicle is remembered before the database is asked again
+UNKNOWN_VEHICLE_CACHE_TIMEOUT = 60
+
+# ReportedData rows are written in bulk once this many are buffered, or every interval
+REPORTED_DATA_FLUSH_SIZE = 200
+REPORTED_DATA_FLUSH_INTERVAL = 1.0  # seconds
+
+# LATRA endpoint and credentials, read from Django settings once at import
+LATRA_URL = settings.LATRA_API_URL
+LATRA_AUTH = f"Basic {settings.LATRA_API_TOKEN}"
+
+# Concurrent LATRA uploads: every processing thread may be waiting on one, and never fewer
+# than the 10 parallel POSTs the listener made before uploads were pooled
+LATRA_UPLOAD_WORKERS = max(10, WORKER_COUNT)
+
+# Longest a processing thread waits for its packet's LATRA upload to finish
+LATRA_RESULT_TIMEOUT = 120  # seconds
+
+# Only connection errors are retried by urllib3 (with exponential backoff): the request never
+# reached LATRA. Read errors and error statuses (a gateway 502/504 may come back after LATRA
+# stored the items) are not, since re-sending the same MGS_IDs would duplicate records.
+LATRA_RETRY = Retry(
+    total=3,
+    connect=3,
+    read=0,
+    status=0,
+    backoff_factor=0.5,
+    allowed_methods=frozenset(["POST"]),
+    raise_on_status=False,  # hand the error response back instead of raising
+)
+
+# Upper bounds on how much of a LATRA response body is read (a misrouted proxy may return a large HTML page)
+LATRA_RESPONSE_BODY_LIMIT = 65536
+LATRA_ERROR_BODY_LIMIT = 4096
+
+_latra_session = None
+_latra_session_lock = threading.Lock()
+
+def _get_latra_session():
+    """Shared keep-alive session for LATRA uploads (created on first use)"""
+    global _latra_session
+    if _latra_session is None:
+        with _latra_session_lock:
+            if _latra_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=LATRA_RETRY)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({
+                    "Authorization": LATRA_AUTH,
+                    "Content-Type": "application/json"
+                })
+                _latra_session = session
+    return _latra_session
+
+def _hex_to_int(hex_str, default=0):
+    """Safely convert hex string to integer with error handling"""
+    try:
+        return int(hex_str, 16) if hex_str else default
+    except ValueError:
+        return default
+
+def _format_local_utc(timestamp_s):
+    """Format an epoch second as "HH:MM:SS DD-MM-YYYY (local) / HH:MM:SS DD-MM-YYYY (utc)" """
+    return (f"{time.strftime('%H:%M:%S %d-%m-%Y', time.localtime(timestamp_s))} (local) / "
+            f"{time.strftime('%H:%M:%S %d-%m-%Y', time.gmtime(timestamp_s))} (utc)")
+
+@functools.lru_cache(maxsize=4096)
+def _format_device_time(timestamp_s):
+    """Cached _format_local_utc for device timestamps, which repeat within a batch"""
+    return _format_local_utc(timestamp_s)
+
+def _int_str(value):
+    """str(int(value)), skipping the int() round trip for values the parser already decoded"""
+    return str(value) if type(value) is int else str(int(value))
+
+def _gps_mode_from_satellites(satellite_count):
+    """GPS mode (d2d3) estimated from satellite count when I/O 181 is absent"""
+    if satellite_count >= 4:
+        return "3"  # Only if we have enough satellites
+    if satellite_count > 0:
+        return "2"  # 2D if some satellites
+    return "0"  # Unknown instead of fake 3D
+
+def _gsm_fields(io_elements, satellite_count):
+    """Return (HDOP, d2d3, RSSI, LAC, Cell_ID, MCC) from actual I/O only, "0" when unknown"""
+    if io_elements.keys().isdisjoint(GSM_FIELD_IOS):
+        return "0", _gps_mode_from_satellites(satellite_count), "0", "0", "0", "0"
+
+    get_io = io_elements.get
+
+    # HDOP (Horizontal Dilution of Precision) - I/O 182, no estimation
+    hdop = get_io(182)
+    hdop_value = f"{hdop / 10:.1f}" if hdop is not None else "0"
+
+    # GPS Mode (2D/3D) - I/O 181 fix type, else satellite count
+    fix_type = get_io(181)
+    if fix_type is not None:
+        gps_mode = "2" if fix_type == 2 else "3"
+    else:
+        gps_mode = _gps_mode_from_satellites(satellite_count)
+
+    # RSSI (I/O 21), LAC (I/O 212) and Cell ID (I/O 213) - no fallback to other I/O
+    rssi = get_io(21)
+    lac = get_io(212)
+    cell_id = get_io(213)
+
+    # MCC (Mobile Country Code) - first 3 digits of the I/O 14 operator code
+    mcc_value = "0"
+    operator_code = get_io(14)
+    if operator_code is not None:
+        try:
+            operator_code_int = int(operator_code)
+            if operator_code_int > 100000:
+                mcc_value = str(operator_code_int)[:3]
+        except (ValueError, TypeError):
+            logger.debug("Invalid operator code: %s, using default MCC", operator_code)
+
+    return (
+        hdop_value,
+        gps_mode,
+        str(rssi) if rssi is not None else "0",
+        str(lac) if lac is not None else "0",
+        str(cell_id) if cell_id is not None else "0",
+        mcc_value,
+    )
+
+def _parse_scaled(value, divisor):
+    """Decode a hex I/O value and scale it to engineering units"""
+    try:
+        return int(value, 16) / divisor if value else 0.0
+    except ValueError:
+        return 0.0
+
+def _parse_s32(value):
+    """Decode a big-endian two's-complement 32-bit hex string"""
+    if not value:
+        return 0
+    if len(value) > 8:
+        raise ValueError(f"{value!r} is wider than 32 bits")
+    n = int(value, 16)
+    return n - 0x100000000 if n & 0x80000000 else n
+
+def _decode_io_value(io_id, value, hex_width):
+    """Binary-path counterpart of GPSListener.sorting_hat for an already unpacked unsigned value"""
+    if io_id in IO_PARSE_INT:
+        return value
+    divisor = IO_PARSE_SCALED.get(io_id)
+    if divisor is not None:
+        return value / divisor
+    if io_id in IO_PARSE_SIGNED32:
+        if hex_width > 8:
+            return f"0x{value:0{hex_width}x}"  # Wider than 32 bits; kept as hex like sorting_hat
+        return value - 0x100000000 if value & 0x80000000 else value
+    if io_id in IO_PARSE_RAW_HEX:
+        return f"{value:0{hex_width}x}"  # Keep raw hex for driver ID
+    return f"0x{value:0{hex_width}x}"
+
+@functools.lru_cache(maxsize=1024, typed=True)
+def _parse_driver_id(hex_value):
+    """Normalise a driver/iButton ID to a 16-digit uppercase hex string"""
+    if isinstance(hex_value, int):
+        return f"{hex_value:016X}"
+    driver_id = str(hex_value)
+    if driver_id.startswith("0x"):
+        driver_id = driver_id[2:]
+    return driver_id.upper().zfill(16)
+
+def _populate_engine_on_addon(addon_info, io_elements):
+    """Fill the driver for Engine ON (2); the ID is sent as read, all zeros included"""
+    raw_driver_id = io_elements.get(245)
+    if raw_driver_id is not None:  # Driver identification
+        addon_info["v_driver_identification_no"] = _parse_driver_id(raw_driver_id)
+
+def _populate_driver_id_addon(addon_info, io_elements):
+    """Fill the driver for Invalid Scan (17) and Regular Ibutton Scan (24)"""
+    raw_driver_id = io_elements.get(245)
+    if raw_driver_id is not None:  # Driver identification
+        driver_id = _parse_driver_id(raw_driver_id)
+        # Use FFFFFFFFFFFFFFFF when no valid identification detected
+        if not driver_id or driver_id == "0000000000000000":
+            driver_id = "FFFFFFFFFFFFFFFF"
+        addon_info["v_driver_identification_no"] = driver_id
+
+# addon_info handlers for activities that need more than a field copy
+ADDON_BUILDERS = {
+    2: _populate_engine_on_addon,
+    17: _populate_driver_id_addon,
+    24: _populate_driver_id_addon,
+}
+
+@functools.lru_cache(maxsize=4096, typed=True)
+def _io_activity_description(io_id, io_value, latra_activity_id):
+    """Generate detailed activity description for I/O elements (memoized)"""
+    
+    # Special handling for specific I/O elements
+    if io_id == 250:  # Trip Start/Stop
+        if io_value == 1:
+            return "Engine Start (Trip Start)"
+        elif io_value == 0:
+            return "Engine Stop (Trip Stop)"
+        else:
+            return f"Trip Event (Value: {io_value})"
+            
+    elif io_id == 239:  # Ignition
+        if io_value == 1:
+            return "Engine ON (Ignition)"
+        elif io_value == 0:
+            return "Engine OFF (Ignition)"
+        else:
+            return f"Ignition Event (Value: {io_value})"
+            
+    elif io_id == 240:  # Movement
+        if io_value == 1:
+            return "Movement/Logging (Movement ON)"
+        elif io_value == 0:
+            return "Movement/Logging (Movement STOP)"
+        else:
+            return f"Movement Event (Value: {io_value})"
+            
+    elif io_id in {67, 113}:  # Battery voltage/level
+        return f"Internal Battery Low (Battery: {io_value})"
+        
+    elif io_id in {66, 65, 114}:  # External power
+        return f"External Power Disconnected (Voltage: {io_value})"
+        
+    elif io_id in {72, 73, 74, 75, 32, 39}:  # Temperature sensors
+        return f"High Temperature Alert (Temp: {io_value})"
+        
+    elif io_id in {201, 202, 203, 204, 207, 208, 209, 210, 212, 213, 214, 215}:  # Fuel data
+        return f"Fuel data report (Fuel: {io_value})"
+        
+    elif io_id in {211, 84, 89}:  # Low fuel
+        return f"Low Fuel Alert (Fuel Level: {io_value})"
+        
+    elif io_id in {78, 403, 404, 405, 406, 407}:  # Driver ID
+        return f"Ibutton Scan (Regular) (Driver ID: {io_value})"
+        
+    elif io_id in {408, 409}:  # Invalid driver
+        return f"Invalid Scan (Driver Issue: {io_value})"
+        
+    elif io_id in range(155, 232):  # Geofence zones
+        zone_num = ((io_id - 155) // 2) + 1
+        if io_id % 2 == 1:  # Odd = Enter
+            return f"Enter Boundary (Zone {zone_num}: {io_value})"
+        else:  # Even = Exit
+            return f"Leave Boundary (Zone {zone_num}: {io_value})"
+            
+    elif io_id in DIGITAL_INPUT_IOS:  # Digital inputs
+        return f"Door Open/Close (Input {io_id}: {io_value})"
+        
+    elif io_id in DIGITAL_OUTPUT_IOS:  # Digital outputs
+        return f"Door Open/Close (Output {io_id}: {io_value})"
+        
+    elif io_id == 381:  # Ground sense
+        return f"Device Tempering (Ground Sense: {io_value})"
+        
+    elif io_id == 252:  # Battery unplug
+        return f"Internal Battery Low (Battery Unplugged: {io_value})"
+        
+    elif io_id == 246:  # Towing
+        return f"Vehicle Theft (Towing Detected: {io_value})"
+        
+    elif io_id == 247:  # Crash
+        return f"Accident (Crash Detection: {io_value})"
+        
+    elif io_id == 255:  # Over speeding
+        return f"Speeding (Over Speed Event: {io_value})"
+        
+    elif io_id in {253, 17, 18, 19}:  # Accelerometer
+        if io_id == 253 or io_id == 19:
+            return f"Hash Braking (Z-Axis: {io_value})"
+        elif io_id == 17:
+            return f"Hash Acceleration (X-Axis: {io_value})"
+        elif io_id == 18:
+            return f"Hash Turning (Y-Axis: {io_value})"
+            
+    elif io_id in {318, 249}:  # Jamming
+        return f"GPS Signal Lost (Jamming: {io_value})"
+        
+    elif io_id == 251:  # Idling
+        return f"Excessive Idle (Idling: {io_value})"
+        
+    elif io_id >= 10800 and io_id <= 10833:  # EYE sensors
+        if io_id <= 10805:
+            return f"High Temperature Alert (EYE Temp {io_id-10799}: {io_value})"
+        elif io_id >= 10820 and io_id <= 10825:
+            return f"Internal Battery Low (EYE Battery {io_id-10819}: {io_value})"
+        elif io_id >= 10830:
+            return f"Movement/Logging (EYE Movement {io_id-10829}: {io_value})"
+        else:
+            return f"EYE Sensor Event (ID {io_id}: {io_value})"
+            
+    elif io_id >= 10500 and io_id <= 10523:  # WSN sensors
+        if io_id <= 10505:
+            return f"High Temperature Alert (WSN Temp {io_id-10499}: {io_value})"
+        elif io_id >= 10510 and io_id <= 10515:
+            return f"Internal Battery Low (WSN Battery {io_id-10509}: {io_value})"
+        elif io_id >= 10520:
+            return f"Door Open/Close (WSN Door {io_id-10519}: {io_value})"
+        else:
+            return f"WSN Sensor Event (ID {io_id}: {io_value})"
+    
+    # OBD-II parameters
+    elif io_id >= 30 and io_id <= 57:
+        if io_id in {30, 31, 40, 42, 43, 47, 49}:
+            return f"Black Box Data Logging (OBD {io_id}: {io_value})"
+        elif io_id in {32, 39, 45}:
+            return f"High Temperature Alert (OBD Temp {io_id}: {io_value})"
+        elif io_id in {34, 35, 36, 41, 50, 52, 53}:
+            return f"Fuel data report (OBD Fuel {io_id}: {io_value})"
+        elif io_id in {33, 44, 51, 54, 55}:
+            return f"Maintenance Alert (OBD {io_id}: {io_value})"
+        elif io_id == 46:
+            return f"Internal Battery Low (OBD Voltage: {io_value})"
+        else:
+            return f"OBD Parameter (ID {io_id}: {io_value})"
+    
+    # CAN Bus parameters
+    elif io_id >= 80 and io_id <= 100:
+        if io_id in {80, 86, 87, 88, 91, 95, 96, 97, 99, 100}:
+            return f"Black Box Data Logging (CAN {io_id}: {io_value})"
+        elif io_id in {82, 98}:
+            return f"High Temperature Alert (CAN Temp {io_id}: {io_value})"
+        elif io_id == 83:
+            return f"Fuel data report (CAN Fuel Consumed: {io_value})"
+        elif io_id in {84, 89}:
+            return f"Low Fuel Alert (CAN Fuel Level: {io_value})"
+        elif io_id == 85:
+            return f"Movement/Logging (CAN Distance: {io_value})"
+        elif io_id == 90:
+            return f"Speeding (CAN Wheel Speed: {io_value})"
+        elif io_id in {92, 93}:
+            return f"Excessive Idle (CAN {io_id}: {io_value})"
+        elif io_id == 94:
+            return f"Maintenance Alert (CAN Service Distance: {io_value})"
+        else:
+            return f"CAN Parameter (ID {io_id}: {io_value})"
+    
+    # Generic descriptions based on LATRA activity ID
+    activity_name = LATRA_ACTIVITY_NAMES.get(latra_activity_id, f"Activity {latra_activity_id}")
+    return f"{activity_name} (I/O {io_id}: {io_value})"
+
 class GPSListener:
     def __init__(self):
         self.host = '0.0.0.0'
         self.port = 2000
-        self.executor = ThreadPoolExecutor(max_workers=10)  # For async processing
-        self.vehicle_cache = {}  # Cache for vehicle lookups
+        # Separate pools so connections blocked in recv can never starve packet processing
+        self.io_executor = ThreadPoolExecutor(max_workers=WORKER_COUNT, thread_name_prefix="gps-io")  # Device connections
+        self.processing_executor = ThreadPoolExecutor(max_workers=WORKER_COUNT, thread_name_prefix="gps-proc")  # DB + LATRA hand-off
+        self.vehicle_cache = collections.OrderedDict()  # LRU of imei -> (vehicle, cached_at)
+        self.vehicle_cache_lock = threading.Lock()
         self.cache_timeout = 300  # 5 minutes cache timeout
-        self.last_cache_clean = time.time()
         self.mgs_id_counter = 10000  # Starting counter for dynamic MGS_ID
         
+        # LATRA upload batching: packets are queued and flushed per vehicle by a background thread
+        self.latra_queue = queue.Queue()
+        self.latra_executor = ThreadPoolExecutor(max_workers=LATRA_UPLOAD_WORKERS, thread_name_prefix="latra")
+        self.latra_batcher = None
+        self.latra_batcher_lock = threading.Lock()
+        
+        # ReportedData rows are buffered and written with bulk_create by a background flusher
+        self.pending_rows = []
+        self.pending_lock = threading.Lock()
+        self.reported_data_flusher = None
+        
         # IMEI Filter Configuration
         # self.allowed_imeis = set()  # Set of allowed IMEIs
         # self.filter_enabled = False  # Enable/disable IMEI filtering
         # self.load_imei_filter_config()
 
     def start_listener(self):
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            s.bind((self.host, self.port))
-            s.listen()
-            print(f"Listening on {self.host}:{self.port}")
-
-            while True:
-                try:
-                    conn, addr = s.accept()
-                    conn.settimeout(30)  # Set timeout for connection
-                    print(f"Connection from {addr}")
-                    
-                    # Handle connection in a separate thread
-                    self.executor.submit(self.handle_connection, conn, addr)
-                    
-                except Exception as e:
-                    print(f"Error accepting connection: {e}")
-                    time.sleep(1)  # Prevent tight loop on errors
+        # Write buffered ReportedData rows before a stop signal ends the process
+        # (handlers can only be installed from the main thread)
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, self.handle_stop_signal)
+            signal.signal(signal.SIGINT, self.handle_stop_signal)
+
+        # A single bound socket, so a second listener instance still fails with EADDRINUSE;
+        # several threads accept on it so connection bursts are drained in parallel
+        acceptor_count = min(4, os.cpu_count() or 1)
+        with self.open_listen_socket() as listen_socket:
+            logger.info("Listening on %s:%s (%d acceptor threads)", self.host, self.port, acceptor_count)
+
+            for number in range(1, acceptor_count):
+                threading.Thread(
+                    target=self.accept_connections, args=(listen_socket,), name=f"gps-accept-{number}", daemon=True
+                ).start()
+            self.accept_connections(listen_socket)
+
+    def handle_stop_signal(self, signum, frame):
+        """Flush buffered ReportedData rows, then let the signal terminate the process"""
+        logger.info("Received signal %s, flushing buffered rows", signum)
+        self.flush_reported_data()
+        signal.signal(signum, signal.SIG_DFL)
+        os.kill(os.getpid(), signum)
+
+    def open_listen_socket(self):
+        """Create a bound, listening TCP socket for the device port"""
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        s.bind((self.host, self.port))
+        s.listen(socket.SOMAXCONN)  # absorb reconnect bursts after a network flap
+        return s
+
+    def accept_connections(self, listen_socket):
+        """Accept device connections on the listening socket and hand them to the I/O pool"""
+        consecutive_errors = 0
+        while True:
+            try:
+                conn, addr = listen_socket.accept()
+                consecutive_errors = 0
+                conn.settimeout(30)  # Set timeout for connection
+                # The 4-byte record-count ACK is tiny: send it without Nagle delay
+                conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                logger.info("Connection from %s", addr)
+                
+                # Handle connection in a separate thread
+                self.io_executor.submit(self.handle_connection, conn, addr)
+                
+            except Exception as e:
+                logger.warning("Error accepting connection: %s", e)
+                # One-off failures (e.g. a client reset before accept) retry at once;
+                # only a run of them (EMFILE, ...) backs off, up to 1s
+                consecutive_errors += 1
+                if consecutive_errors >= 3:
+                    time.sleep(min(0.001 * 2 ** consecutive_errors, 1.0))
 
     def handle_connection(self, conn, addr):
         device_imei = None
+        # One receive buffer per connection; each read is a zero-copy view into it
+        buffer = bytearray(RECV_BUFFER_SIZE)
+        view = memoryview(buffer)
         try:
             while True:
-                data = conn.recv(1024)
-                if not data:
+                received = conn.recv_into(buffer)
+                if not received:
                     break
 
-                hex_data = data.hex()
+                data = view[:received]
                 
                 # Check if this is an IMEI packet
-                if self.imei_checker(hex_data):
-                    device_imei = self.ascii_imei_converter(hex_data)
-                    print(f"IMEI received: {device_imei}")
+                if self.imei_checker(data):
+                    device_imei = self.ascii_imei_converter(data)
+                    logger.info("IMEI received: %s", device_imei)
                     conn.sendall((1).to_bytes(1, byteorder="big"))
                     continue
 
                 # Process data if we have an IMEI
                 if device_imei:
-                    if self.codec_8e_checker(hex_data):
+                    if self.codec_8e_checker(data):
                         try:
-                            # Parse the data
-                            parsed_data = self.codec_8e_parser(hex_data, device_imei)
+                            # Copy out of the receive buffer: the packet outlives this read
+                            packet = bytes(data)
+                            parsed_data = self.codec_8e_parser_bin(packet, device_imei)
                             
                             # Process asynchronously to not block the connection
-                            self.executor.submit(
+                            self.processing_executor.submit(
                                 self.process_parsed_data, 
                                 device_imei, 
-                                hex_data, 
+                                packet, 
                                 parsed_data
                             )
                             
@@ -533,29 +1040,24 @@ class GPSListener:
                             conn.sendall((len(parsed_data['records'])).to_bytes(4, byteorder="big"))
                             
                         except Exception as e:
-                            print(f"Error parsing data: {e}")
+                            logger.error("Error parsing data from %s: %s", addr, e)
                             break
 
         except socket.timeout:
-            print(f"Connection with {addr} timed out")
+            logger.info("Connection with %s timed out", addr)
         except Exception as e:
-            print(f"Error handling connection from {addr}: {e}")
+            logger.error("Error handling connection from %s: %s", addr, e)
         finally:
             conn.close()
-            print(f"Connection with {addr} closed")
+            logger.info("Connection with %s closed", addr)
 
-    def process_parsed_data(self, device_imei, hex_data, parsed_data):
+    def process_parsed_data(self, device_imei, packet, parsed_data):
         """Process parsed data asynchronously"""
         try:
-            # Clean cache periodically
-            if time.time() - self.last_cache_clean > self.cache_timeout:
-                self.clean_vehicle_cache()
-                self.last_cache_clean = time.time()
-            
             # Get vehicle from cache or database
             vehicle = self.get_cached_vehicle(device_imei)
             if not vehicle:
-                print(f"⚠️ No vehicle found with IMEI {device_imei} - BUT WILL STILL SEND TO LATRA")
+                logger.info("No vehicle found with IMEI %s - still sending to LATRA", device_imei)
                 # Create a temporary vehicle object for LATRA transmission
                 from types import SimpleNamespace
                 temp_imei = SimpleNamespace()
@@ -565,118 +1067,159 @@ class GPSListener:
                 vehicle.id = 999999  # Temporary ID for unregistered vehicles
                 vehicle.name = device_imei[-6:]  # Use last 6 digits of IMEI without prefix
                 vehicle.registration_number = device_imei[-6:]  # Use last 6 digits as registration
-                print(f"🚀 SENDING TO LATRA with temporary vehicle profile: {vehicle.name}")
+                logger.debug("Sending to LATRA with temporary vehicle profile: %s", vehicle.name)
             
             # Send to LATRA (ALWAYS send regardless of vehicle registration)
-            success, response = self.send_to_latra(vehicle, parsed_data)
+            try:
+                success, response = self.queue_for_latra(vehicle, parsed_data).result(timeout=LATRA_RESULT_TIMEOUT)
+            except FutureTimeoutError:
+                # The upload keeps running and may still succeed: record the outcome as unknown
+                logger.warning("LATRA upload for IMEI %s did not finish within %ss", device_imei, LATRA_RESULT_TIMEOUT)
+                success, response = False, {
+                    "error": f"LATRA upload did not finish within {LATRA_RESULT_TIMEOUT}s",
+                    "pending": True,
+                }
             
             # Save to database only if vehicle exists in database
             if hasattr(vehicle, '_state'):  # Check if it's a real Django model instance
-                self.save_reported_data(vehicle, hex_data, parsed_data, response, success)
+                # The hex dump is only built for rows that are actually stored
+                self.save_reported_data(vehicle, packet.hex(), parsed_data, response, success)
             else:
-                print(f"📝 Skipping database save for unregistered vehicle {device_imei} - LATRA transmission completed")
+                logger.debug("Skipping database save for unregistered vehicle %s - LATRA transmission completed", device_imei)
             
         except Exception as e:
-            print(f"Error processing data: {e}")
+            logger.error("Error processing data for IMEI %s: %s", device_imei, e)
         finally:
-            # Ensure database connection is closed
-            connection.close()
+            # Keep the thread's connection for the next packet; only drop it if broken or past CONN_MAX_AGE
+            connection.close_if_unusable_or_obsolete()
 
     def get_cached_vehicle(self, imei):
-        """Get vehicle from cache or database with cache invalidation"""
-        now = time.time()
+        """Get vehicle from the bounded LRU cache or database, expiring entries after cache_timeout"""
+        now = time.monotonic()
         
         # Check cache first
-        if imei in self.vehicle_cache:
-            vehicle, timestamp = self.vehicle_cache[imei]
-            if now - timestamp < self.cache_timeout:
-                return vehicle
+        with self.vehicle_cache_lock:
+            cached = self.vehicle_cache.get(imei)
+            if cached is not None:
+                vehicle, cached_at = cached
+                # Unknown IMEIs are cached as None for a shorter window
+                ttl = self.cache_timeout if vehicle is not None else UNKNOWN_VEHICLE_CACHE_TIMEOUT
+                if now - cached_at < ttl:
+                    self.vehicle_cache.move_to_end(imei)
+                    return vehicle
+                del self.vehicle_cache[imei]
         
         # Not in cache or expired, query database
-        vehicle = Vehicle.objects.filter(imei__imei_number=imei).first()
-        if vehicle:
+        vehicle = Vehicle.objects.select_related('imei').filter(imei__imei_number=imei).first()
+        with self.vehicle_cache_lock:
             self.vehicle_cache[imei] = (vehicle, now)
+            self.vehicle_cache.move_to_end(imei)
+            if len(self.vehicle_cache) > VEHICLE_CACHE_SIZE:
+                self.vehicle_cache.popitem(last=False)  # evict the least recently used
         return vehicle
 
-    def clean_vehicle_cache(self):
-        """Clean expired cache entries"""
-        now = time.time()
-        expired = [k for k, (_, t) in self.vehicle_cache.items() 
-                  if now - t > self.cache_timeout]
-        for k in expired:
-            del self.vehicle_cache[k]
-
     def save_reported_data(self, vehicle, hex_data, parsed_data, response, success):
-        """Save reported data with bulk create optimization if needed"""
+        """Buffer a ReportedData row; rows are written in bulk by flush_reported_data"""
+        if self.reported_data_flusher is None:
+            with self.pending_lock:
+                if self.reported_data_flusher is None:
+                    self.reported_data_flusher = threading.Thread(
+                        target=self.reported_data_flush_worker, name="reported-data-flusher", daemon=True
+                    )
+                    self.reported_data_flusher.start()
+
+        row = ReportedData(
+            vehicle=vehicle,
+            raw_data={"hex": hex_data},
+            processed_data=parsed_data,
+            latra_response=response,
+            is_success=success
+        )
+        with self.pending_lock:
+            self.pending_rows.append(row)
+            flush_now = len(self.pending_rows) >= REPORTED_DATA_FLUSH_SIZE
+        if flush_now:
+            self.flush_reported_data()
+
+    def flush_reported_data(self):
+        """Write all buffered ReportedData rows with a single bulk_create"""
+        with self.pending_lock:
+            rows, self.pending_rows = self.pending_rows, []
+        if not rows:
+            return
         try:
-            ReportedData.objects.create(
-                vehicle=vehicle,
-                raw_data={"hex": hex_data},
-                processed_data=parsed_data,
-                latra_response=response,
-                is_success=success
-            )
+            ReportedData.objects.bulk_create(rows, batch_size=500)
         except Exception as e:
-            print(f"Error saving to database: {e}")
-
-    def imei_checker(self, hex_imei):
-        """Check if hex string is a valid IMEI packet"""
-        try:
-            if len(hex_imei) < 4:
-                return False
-                
-            imei_length = int(hex_imei[:4], 16)
-            actual_length = len(hex_imei[4:]) // 2
-            return imei_length == actual_length
-        except ValueError:
-            return False
-
-    def ascii_imei_converter(self, hex_imei):
-        """Convert hex IMEI to ASCII"""
+            # bulk_create is all-or-nothing: save row by row so one bad row cannot drop the batch
+            logger.error("Error saving %d rows to database: %s; retrying one by one", len(rows), e)
+            connection.close_if_unusable_or_obsolete()
+            self.save_rows_individually(rows)
+
+    def save_rows_individually(self, rows):
+        """Save ReportedData rows one at a time, logging the ones that still fail"""
+        failed = 0
+        for row in rows:
+            try:
+                row.save()
+            except Exception as e:
+                failed += 1
+                logger.error("Error saving ReportedData row for vehicle %s: %s", row.vehicle_id, e)
+        if failed:
+            logger.error("Dropped %d of %d ReportedData rows", failed, len(rows))
+
+    def reported_data_flush_worker(self):
+        """Flush buffered ReportedData rows every REPORTED_DATA_FLUSH_INTERVAL"""
+        while True:
+            time.sleep(REPORTED_DATA_FLUSH_INTERVAL)
+            self.flush_reported_data()
+            connection.close_if_unusable_or_obsolete()
+
+    def imei_checker(self, packet):
+        """Check if a received packet is an IMEI packet"""
+        # Teltonika IMEI packet: length prefix 0x000F followed by the 15 ASCII digits
+        return len(packet) == 17 and packet[0] == 0 and packet[1] == 15
+
+    def ascii_imei_converter(self, packet):
+        """Read the ASCII IMEI out of an IMEI packet"""
         try:
-            return bytes.fromhex(hex_imei[4:]).decode('ascii')
-        except Exception:
+            return bytes(packet[2:]).decode('ascii')
+        except UnicodeDecodeError:
             return "INVALID_IMEI"
 
-    def codec_8e_checker(self, codec8_packet):
-        """Check if packet is valid Codec8/8E format"""
-        try:
-            if len(codec8_packet) < 18:
-                return False
-            
-            codec_type = codec8_packet[16:18]
-            return codec_type.upper() in ["8E", "08"]
-        except Exception:
-            return False
+    def codec_8e_checker(self, packet):
+        """Check if a received packet is in Codec8/8E format"""
+        return len(packet) >= 9 and packet[8] in (0x08, 0x8E)
 
     def safe_hex_to_int(self, hex_str, default=0):
         """Safely convert hex string to integer with error handling"""
-        try:
-            return int(hex_str, 16) if hex_str else default
-        except ValueError:
-            return default
+        return _hex_to_int(hex_str, default)
 
-    def codec_8e_parser(self, codec8_packet, device_imei):
-        """Parse Codec8/8E packet with error handling"""
+    def codec_8e_parser_bin(self, packet, device_imei):
+        """Parse a raw Codec8/8E packet with error handling"""
         result = {
             "device_imei": device_imei,
             "server_time": self.time_stamper_for_json(),
-            "raw_data": codec8_packet,
             "records": [],
             "parse_errors": []
         }
 
+        # Resolved once per packet; every parser debug message below is behind this flag
+        debug_enabled = parser_logger.isEnabledFor(logging.DEBUG)
+
         try:
-            # Get codec type (8 or 8E)
-            codec_type = codec8_packet[16:18]
-            data_step = 4 if codec_type.upper() == "8E" else 2
+            # Header: preamble, data field length, codec id, number of records
+            _, _, codec_id, number_of_records = AVL_PACKET_HEADER.unpack_from(packet)
+            is_codec_8e = codec_id == 0x8E
+            codec = 0x8E if is_codec_8e else 0x08
 
-            # Number of records (1 byte after codec type)
-            number_of_records = self.safe_hex_to_int(codec8_packet[18:20])
-            
-            # Start parsing records (skip first 10 bytes of header)
-            avl_data_start = codec8_packet[20:]
-            data_field_position = 0
+            # Codec-specific layouts: 1-byte (Codec 8) or 2-byte (Codec 8E) event id, counts and I/O ids
+            record_header = AVL_RECORD_HEADERS[codec]
+            count_struct = AVL_COUNT_STRUCTS[codec]
+            count_size = count_struct.size
+            io_structs = AVL_IO_STRUCTS[codec]
+
+            # Records start right after the 10-byte header
+            data_field_position = AVL_PACKET_HEADER.size
 
             for record_num in range(number_of_records):
                 try:
@@ -686,161 +1229,70 @@ class GPSListener:
                         "parse_errors": []
                     }
 
-                    # Timestamp (8 bytes)
-                    timestamp = avl_data_start[data_field_position:data_field_position+16]
+                    # Fixed part: timestamp, priority, longitude, latitude, altitude, angle,
+                    # satellites, speed, event IO id and total IO count
+                    (timestamp, priority, longitude, latitude, altitude, angle,
+                     satellites, parsed_speed, event_io_id, _) = record_header.unpack_from(packet, data_field_position)
+                    data_field_position += record_header.size
+
                     record["timestamp"] = self.device_time_stamper(timestamp)
+                    record["timestamp_ms"] = timestamp
                     record["timestamp_delay"] = self.record_delay_counter(timestamp)
-                    data_field_position += 16
-
-                    # Priority (1 byte)
-                    priority = avl_data_start[data_field_position:data_field_position+2]
-                    record["priority"] = self.safe_hex_to_int(priority)
-                    data_field_position += 2
-
-                    # Longitude (4 bytes)
-                    longitude = avl_data_start[data_field_position:data_field_position+8]
-                    record["longitude"] = self.coordinate_formater(longitude)
-                    print(f"DEBUG: Longitude - Hex: {longitude}, Parsed: {record['longitude']}")
-                    data_field_position += 8
-
-                    # Latitude (4 bytes)
-                    latitude = avl_data_start[data_field_position:data_field_position+8]
-                    record["latitude"] = self.coordinate_formater(latitude)
-                    print(f"DEBUG: Latitude - Hex: {latitude}, Parsed: {record['latitude']}")
-                    data_field_position += 8
-
-                    # Altitude (2 bytes)
-                    altitude = avl_data_start[data_field_position:data_field_position+4]
-                    record["altitude"] = self.safe_hex_to_int(altitude)
-                    data_field_position += 4
-
-                    # Angle (2 bytes)
-                    angle = avl_data_start[data_field_position:data_field_position+4]
-                    record["angle"] = self.safe_hex_to_int(angle)
-                    data_field_position += 4
-
-                    # Satellites (1 byte)
-                    satellites = avl_data_start[data_field_position:data_field_position+2]
-                    record["satellites"] = self.safe_hex_to_int(satellites)
-                    data_field_position += 2
-
-                    # Speed (2 bytes)
-                    speed = avl_data_start[data_field_position:data_field_position+4]
-                    parsed_speed = self.safe_hex_to_int(speed)
-                    record["speed"] = parsed_speed
-                    
-                    # Debug: Print speed information
-                    if parsed_speed > 0:
-                        print(f"DEBUG: Speed detected - Raw hex: {speed}, Parsed: {parsed_speed} km/h")
-                    
-                    data_field_position += 4
-
-                    # Event IO ID (1 or 2 bytes)
-                    event_io_id = avl_data_start[data_field_position:data_field_position+data_step]
-                    record["event_id"] = self.safe_hex_to_int(event_io_id)
-                    data_field_position += data_step
+                    record["priority"] = priority
 
-                    # Total IO elements (1 or 2 bytes)
-                    total_io_elements = avl_data_start[data_field_position:data_field_position+data_step]
-                    total_io_elements_parsed = self.safe_hex_to_int(total_io_elements)
-                    data_field_position += data_step
+                    # Coordinates are signed 1e-7 degrees
+                    record["longitude"] = longitude / 1e7
+                    record["latitude"] = latitude / 1e7
+                    if debug_enabled:
+                        parser_logger.debug(
+                            "Longitude hex=%08x parsed=%s, latitude hex=%08x parsed=%s",
+                            longitude & 0xFFFFFFFF, record["longitude"], latitude & 0xFFFFFFFF, record["latitude"],
+                        )
 
-                    # Parse I/O elements
-                    io_elements = {}
+                    record["altitude"] = altitude
+                    record["angle"] = angle
+                    record["satellites"] = satellites
 
-                    # 1 byte I/O count
-                    byte1_io_number = avl_data_start[data_field_position:data_field_position+data_step]
-                    byte1_io_number_parsed = self.safe_hex_to_int(byte1_io_number)
-                    data_field_position += data_step
+                    # GPS fix flags, computed once for the detection fallbacks below
+                    gps_valid = record["latitude"] != 0 or record["longitude"] != 0
+                    gps_signal_lost = record["satellites"] == 0 and not gps_valid
 
-                    for _ in range(byte1_io_number_parsed):
-                        try:
-                            key = avl_data_start[data_field_position:data_field_position+data_step]
-                            data_field_position += data_step
-                            value = avl_data_start[data_field_position:data_field_position+2]
-                            io_elements[self.safe_hex_to_int(key)] = self.sorting_hat(
-                                self.safe_hex_to_int(key), 
-                                value
-                            )
-                            data_field_position += 2
-                        except Exception as e:
-                            record["parse_errors"].append(f"1-byte IO parse error: {str(e)}")
-                            continue
-
-                    # 2 byte I/O count
-                    byte2_io_number = avl_data_start[data_field_position:data_field_position+data_step]
-                    byte2_io_number_parsed = self.safe_hex_to_int(byte2_io_number)
-                    data_field_position += data_step
-
-                    for _ in range(byte2_io_number_parsed):
-                        try:
-                            key = avl_data_start[data_field_position:data_field_position+data_step]
-                            data_field_position += data_step
-                            value = avl_data_start[data_field_position:data_field_position+4]
-                            io_elements[self.safe_hex_to_int(key)] = self.sorting_hat(
-                                self.safe_hex_to_int(key), 
-                                value
-                            )
-                            data_field_position += 4
-                        except Exception as e:
-                            record["parse_errors"].append(f"2-byte IO parse error: {str(e)}")
-                            continue
+                    record["speed"] = parsed_speed
+                    
+                    if debug_enabled and parsed_speed > 0:
+                        parser_logger.debug("Speed detected: %d km/h", parsed_speed)
 
-                    # 4 byte I/O count
-                    byte4_io_number = avl_data_start[data_field_position:data_field_position+data_step]
-                    byte4_io_number_parsed = self.safe_hex_to_int(byte4_io_number)
-                    data_field_position += data_step
+                    record["event_id"] = event_io_id
 
-                    for _ in range(byte4_io_number_parsed):
-                        try:
-                            key = avl_data_start[data_field_position:data_field_position+data_step]
-                            data_field_position += data_step
-                            value = avl_data_start[data_field_position:data_field_position+8]
-                            io_elements[self.safe_hex_to_int(key)] = self.sorting_hat(
-                                self.safe_hex_to_int(key), 
-                                value
-                            )
-                            data_field_position += 8
-                        except Exception as e:
-                            record["parse_errors"].append(f"4-byte IO parse error: {str(e)}")
-                            continue
+                    # Parse I/O elements
+                    io_elements = {}
 
-                    # 8 byte I/O count
-                    byte8_io_number = avl_data_start[data_field_position:data_field_position+data_step]
-                    byte8_io_number_parsed = self.safe_hex_to_int(byte8_io_number)
-                    data_field_position += data_step
+                    # 1, 2, 4 and 8 byte I/O groups: count, then (id, value) pairs
+                    for value_bytes, io_struct in zip(IO_VALUE_SIZES, io_structs):
+                        hex_width = 2 * value_bytes
+                        (io_count,) = count_struct.unpack_from(packet, data_field_position)
+                        data_field_position += count_size
 
-                    for _ in range(byte8_io_number_parsed):
-                        try:
-                            key = avl_data_start[data_field_position:data_field_position+data_step]
-                            data_field_position += data_step
-                            value = avl_data_start[data_field_position:data_field_position+16]
-                            io_elements[self.safe_hex_to_int(key)] = self.sorting_hat(
-                                self.safe_hex_to_int(key), 
-                                value
-                            )
-                            data_field_position += 16
-                        except Exception as e:
-                            record["parse_errors"].append(f"8-byte IO parse error: {str(e)}")
-                            continue
+                        for _ in range(io_count):
+                            try:
+                                io_id, value = io_struct.unpack_from(packet, data_field_position)
+                                data_field_position += io_struct.size
+                                io_elements[io_id] = _decode_io_value(io_id, value, hex_width)
+                            except Exception as e:
+                                record["parse_errors"].append(f"{value_bytes}-byte IO parse error: {str(e)}")
+                                continue
 
                     # X byte I/O count (Codec 8E only)
-                    if codec_type.upper() == "8E":
-                        byteX_io_number = avl_data_start[data_field_position:data_field_position+4]
-                        byteX_io_number_parsed = self.safe_hex_to_int(byteX_io_number)
-                        data_field_position += 4
+                    if is_codec_8e:
+                        (byteX_io_number,) = count_struct.unpack_from(packet, data_field_position)
+                        data_field_position += count_size
 
-                        for _ in range(byteX_io_number_parsed):
+                        for _ in range(byteX_io_number):
                             try:
-                                key = avl_data_start[data_field_position:data_field_position+4]
-                                data_field_position += 4
-                                value_length = avl_data_start[data_field_position:data_field_position+4]
-                                data_field_position += 4
-                                value = avl_data_start[data_field_position:data_field_position+(2 * self.safe_hex_to_int(value_length))]
-                                io_elements[self.safe_hex_to_int(key)] = self.sorting_hat(
-                                    self.safe_hex_to_int(key), 
-                                    value
-                                )
+                                io_id, value_length = AVL_XIO_HEADER.unpack_from(packet, data_field_position)
+                                data_field_position += AVL_XIO_HEADER.size
+                                value = packet[data_field_position:data_field_position+value_length]
+                                io_elements[io_id] = self.sorting_hat(io_id, bytes(value).hex())
                                 data_field_position += len(value)
                             except Exception as e:
                                 record["parse_errors"].append(f"X-byte IO parse error: {str(e)}")
@@ -853,29 +1305,36 @@ class GPSListener:
                     event_id = record.get("event_id", 0)
 
                     # Log all detected events and I/O elements for debugging
-                    print(f"\n=== EVENT DETECTION DEBUG FOR RECORD {record_num + 1} ===")
-                    print(f"IMEI: {device_imei}")
-                    print(f"Timestamp: {record.get('timestamp', 'N/A')}")
-                    print(f"Event ID: {event_id} (0x{event_id:02X})")
-                    print(f"Available I/O Elements: {list(io_elements.keys())}")
-                    if io_elements:
-                        print("I/O Element Details:")
-                        for io_id, io_value in io_elements.items():
-                            print(f"  - I/O {io_id}: {io_value}")
-                    print(f"Speed: {record.get('speed', 0)} km/h")
-                    print(f"Location: {record.get('latitude', 0)}, {record.get('longitude', 0)}")
-                    print("=== END EVENT DETECTION DEBUG ===\n")
+                    if debug_enabled:
+                        lines = [
+                            f"=== EVENT DETECTION DEBUG FOR RECORD {record_num + 1} ===",
+                            f"IMEI: {device_imei}",
+                            f"Timestamp: {record.get('timestamp', 'N/A')}",
+                            f"Event ID: {event_id} (0x{event_id:02X})",
+                        ]
+                        if io_elements:
+                            lines.append(f"I/O Element Details ({len(io_elements)} elements):")
+                            for io_id, io_value in itertools.islice(io_elements.items(), 5):  # Show first 5
+                                lines.append(f"  - I/O {io_id}: {io_value}")
+                            if len(io_elements) > 5:
+                                lines.append(f"  ... and {len(io_elements) - 5} more I/O elements")
+                        lines.append(f"Speed: {record.get('speed', 0)} km/h")
+                        lines.append(f"Location: {record.get('latitude', 0)}, {record.get('longitude', 0)}")
+                        parser_logger.debug("\n".join(lines))
 
                     # Check for activity code and event ID - Priority: Event ID > I/O Elements
                     detected_activity = None
                     latra_activity_id = None
+
+                    # Single lookup per I/O id (None = absent) instead of `in` + `[]`
+                    movement_state = io_elements.get(240)
+                    ignition_state = io_elements.get(239)
                     
                     # Primary: Check Event ID field (most reliable source)
-                    if event_id and event_id != 0:
+                    if event_id:
                         # Map Teltonika Event ID to LATRA Activity ID
-                        latra_activity_id = ACTIVITY_CODES.get(event_id)
-                        if latra_activity_id and isinstance(latra_activity_id, str) and latra_activity_id.isdigit():
-                            detected_activity = int(latra_activity_id)
+                        detected_activity = EVENT_TO_LATRA_ID.get(event_id)
+                        if detected_activity is not None:
                             event_activity_name = f"Event ID {event_id} -> LATRA Activity {detected_activity}"
                         else:
                             # For unmapped Event IDs, create reasonable LATRA activity mappings
@@ -884,36 +1343,39 @@ class GPSListener:
                                 event_activity_name = f"System Event {event_id} -> Movement/Logging"
                             else:
                                 detected_activity = event_id if event_id <= 50 else 1  # Use event ID if valid LATRA range
-                                event_activity_name = ACTIVITY_CODES.get(event_id, f"Event ID {event_id}")
+                                event_activity_name = f"Event ID {event_id}"
                         
-                        print(f"🔥 EVENT ID DETECTED: {event_id} (0x{event_id:02X}) -> LATRA Activity: {detected_activity} ({event_activity_name})")
+                        if debug_enabled:
+                            parser_logger.debug(f"🔥 EVENT ID DETECTED: {event_id} (0x{event_id:02X}) -> LATRA Activity: {detected_activity} ({event_activity_name})")
                         record["activity"] = f"{detected_activity} - {event_activity_name} (Event ID)"
                         # Display activity-specific data for Event ID based activities
                         self.display_activity_specific_data(detected_activity, record)
                     
                     # Secondary: Check I/O element 240 (Movement) if no Event ID
-                    elif 240 in io_elements:
-                        movement_state = io_elements[240]
+                    elif movement_state is not None:
                         if movement_state == 1:  # Movement detected
                             detected_activity = 1  # LATRA Activity ID 1 (Movement/Logging)
                             record["activity"] = "1 - Movement/Logging (I/O 240 Movement ON)"
-                            print(f"🚗 MOVEMENT DETECTED via I/O 240: Movement ON (State: {movement_state}) -> LATRA Activity 1")
+                            if debug_enabled:
+                                parser_logger.debug(f"🚗 MOVEMENT DETECTED via I/O 240: Movement ON (State: {movement_state}) -> LATRA Activity 1")
                         elif movement_state == 0:  # Movement stopped
                             detected_activity = 1  # LATRA Activity ID 1 (Movement/Logging)
                             record["activity"] = "1 - Movement/Logging (I/O 240 Movement OFF)"
-                            print(f"🛑 MOVEMENT DETECTED via I/O 240: Movement OFF (State: {movement_state}) -> LATRA Activity 1")
+                            if debug_enabled:
+                                parser_logger.debug(f"🛑 MOVEMENT DETECTED via I/O 240: Movement OFF (State: {movement_state}) -> LATRA Activity 1")
                     
                     # Tertiary: Check I/O element 239 (Ignition) if no Event ID or Movement
-                    elif 239 in io_elements:
-                        ignition_state = io_elements[239]
+                    elif ignition_state is not None:
                         if ignition_state == 1:  # Ignition ON
                             detected_activity = 2  # LATRA Activity ID 2 (Engine ON)
                             record["activity"] = "2 - Engine ON (I/O 239 Ignition ON)"
-                            print(f"🔑 IGNITION DETECTED via I/O 239: Ignition ON (State: {ignition_state}) -> LATRA Activity 2")
+                            if debug_enabled:
+                                parser_logger.debug(f"🔑 IGNITION DETECTED via I/O 239: Ignition ON (State: {ignition_state}) -> LATRA Activity 2")
                         elif ignition_state == 0:  # Ignition OFF
                             detected_activity = 3  # LATRA Activity ID 3 (Engine OFF)
                             record["activity"] = "3 - Engine OFF (I/O 239 Ignition OFF)"
-                            print(f"🔑 IGNITION DETECTED via I/O 239: Ignition OFF (State: {ignition_state}) -> LATRA Activity 3")
+                            if debug_enabled:
+                                parser_logger.debug(f"🔑 IGNITION DETECTED via I/O 239: Ignition OFF (State: {ignition_state}) -> LATRA Activity 3")
                     
                     # COMPREHENSIVE I/O ELEMENT DETECTION - Check all I/O elements for activities
                     if not detected_activity:
@@ -924,288 +1386,225 @@ class GPSListener:
                             if speed_int > 80:  # Configurable speed limit
                                 detected_activity = 4  # LATRA Activity ID 4 (Speeding)
                                 record["activity"] = f"4 - Speeding ({speed_value} km/h)"
-                                print(f"🏎️ SPEEDING DETECTED: {speed_value} km/h -> LATRA Activity 4")
+                                if debug_enabled:
+                                    parser_logger.debug(f"🏎️ SPEEDING DETECTED: {speed_value} km/h -> LATRA Activity 4")
                         except (ValueError, TypeError):
-                            print(f"DEBUG: Invalid speed value: {speed_value}, skipping speeding check")
+                            if debug_enabled:
+                                parser_logger.debug(f"DEBUG: Invalid speed value: {speed_value}, skipping speeding check")
                         
                         # ENHANCED I/O ELEMENT MAPPING - Use the comprehensive ACTIVITY_CODES mapping
                         if not detected_activity:
-                            # Sort I/O elements by priority (critical events first)
-                            priority_io_elements = [
-                                # Critical safety events (highest priority)
-                                (252, "9", "Unplug (Battery Unplugged) -> Internal Battery Low"),
-                                (246, "33", "Towing -> Vehicle Theft"),
-                                (247, "12", "Crash Detection -> Accident"),
-                                (253, "5", "Green Driving Event (harsh braking) -> Hash Braking"),
-                                (254, "7", "Green Driving Value (harsh acceleration) -> Hash Acceleration"),
-                                (255, "4", "Over Speeding -> Speeding"),
-                                (8, "8", "Panic Button -> Panic Button (Driver)"),
-                                (318, "26", "GNSS Jamming -> GPS Signal Lost"),
-                                
-                                # Driver identification events (high priority for iButton scanning)
-                                (78, "24", "iButton -> Ibutton Scan (Regular)"),
-                                (245, "24", "Driver ID -> Ibutton Scan (Regular)"),
-                                (403, "24", "Driver 1 ID -> Ibutton Scan (Regular)"),
-                                (404, "24", "Driver 2 ID -> Ibutton Scan (Regular)"),
-                                (405, "24", "Driver 3 ID -> Ibutton Scan (Regular)"),
-                                (406, "24", "Driver 4 ID -> Ibutton Scan (Regular)"),
-                                (407, "24", "Driver 5 ID -> Ibutton Scan (Regular)"),
-                                (408, "17", "Unknown Driver -> Invalid Scan"),
-                                (409, "17", "Driving without Card -> Invalid Scan"),
-                                (207, "24", "RFID Tag -> Ibutton Scan (Regular)"),
-                                (264, "24", "Barcode ID -> Ibutton Scan (Regular)"),
-                                (100, "24", "Magnetic Card ID -> Ibutton Scan (Regular)"),
-                                
-                                # Power management events
-                                (67, "9", "Battery Voltage -> Internal Battery Low"),
-                                (66, "10", "External Voltage -> External Power Disconnected"),
-                                (65, "10", "Power Input 2 -> External Power Disconnected"),
-                                (113, "9", "Battery Level -> Internal Battery Low"),
-                                (114, "10", "LVCAN Power -> External Power Disconnected"),
-                                
-                                # Trip and driving events
-                                (250, "18", "Trip Start/Stop -> Engine Start/Stop"),
-                                (251, "11", "Idling -> Excessive Idle"),
-                                
-                                # Temperature monitoring
-                                (72, "37", "Dallas Temperature 1 -> High Temperature Alert"),
-                                (73, "37", "Dallas Temperature 2 -> High Temperature Alert"),
-                                (74, "37", "Dallas Temperature 3 -> High Temperature Alert"),
-                                (75, "37", "Dallas Temperature 4 -> High Temperature Alert"),
-                                (32, "37", "OBD Coolant Temperature -> High Temperature Alert"),
-                                
-                                # Fuel monitoring
-                                (201, "16", "Fuel Level 1 -> Fuel data report"),
-                                (202, "16", "Fuel Level 2 -> Fuel data report"),
-                                (203, "16", "Fuel Used 1 -> Fuel data report"),
-                                (204, "16", "Fuel Used 2 -> Fuel data report"),
-                                (211, "36", "Fuel Level Warning -> Low Fuel Alert"),
-                                (84, "36", "CAN Fuel Level -> Low Fuel Alert"),
-                                (89, "36", "CAN Fuel Level % -> Low Fuel Alert"),
-                                
-                                # Geofence events (sample - full list too long for inline)
-                                (155, "20", "Geofence Zone 01 -> Enter Boundary"),
-                                (156, "21", "Geofence Zone 01 Exit -> Leave Boundary"),
-                                (157, "20", "Geofence Zone 02 -> Enter Boundary"),
-                                (158, "21", "Geofence Zone 02 Exit -> Leave Boundary"),
-                                
-                                # Digital I/O
-                                (1, "39", "Digital Input 1 -> Door Open/Close"),
-                                (2, "39", "Digital Input 2 -> Door Open/Close"),
-                                (3, "39", "Digital Input 3 -> Door Open/Close"),
-                                (381, "14", "Ground Sense -> Device Tempering"),
-                                
-                                # Environmental sensors
-                                (10800, "37", "EYE Temperature 1 -> High Temperature Alert"),
-                                (10820, "9", "EYE Low Battery 1 -> Internal Battery Low"),
-                                (10500, "37", "WSN Temperature 1 -> High Temperature Alert"),
-                                (10510, "9", "WSN Battery Level 1 -> Internal Battery Low"),
-                            ]
-                            
-                            # Check each I/O element present against the priority list
-                            for io_id in io_elements:
-                                if io_id in ACTIVITY_CODES:
-                                    latra_activity = ACTIVITY_CODES[io_id]
-                                    if isinstance(latra_activity, str) and latra_activity.isdigit():
-                                        io_value = io_elements[io_id]
-                                        detected_activity = int(latra_activity)
-                                        
-                                        # Special handling for specific I/O elements
-                                        activity_description = self.get_io_activity_description(io_id, io_value, detected_activity)
-                                        record["activity"] = f"{detected_activity} - {activity_description}"
-                                        print(f"🔌 I/O ELEMENT {io_id} DETECTED: Value={io_value} -> LATRA Activity {detected_activity} ({activity_description})")
-                                        break  # Take first match (priority order)
+                            # Check each I/O element present against ACTIVITY_CODES
+                            for io_id, io_value in io_elements.items():
+                                io_activity = EVENT_TO_LATRA_ID.get(io_id)
+                                if io_activity is not None:
+                                    detected_activity = io_activity
+                                    
+                                    # Special handling for specific I/O elements
+                                    activity_description = self.get_io_activity_description(io_id, io_value, detected_activity)
+                                    record["activity"] = f"{detected_activity} - {activity_description}"
+                                    if debug_enabled:
+                                        parser_logger.debug(f"🔌 I/O ELEMENT {io_id} DETECTED: Value={io_value} -> LATRA Activity {detected_activity} ({activity_description})")
+                                    break  # Take first match (priority order)
                         
-                        # Check for low internal battery (I/O 67 - Battery Voltage)
-                        if not detected_activity and 67 in io_elements:
-                            battery_voltage = io_elements[67]
-                            try:
-                                # Convert to voltage (Teltonika uses raw ADC values that need conversion)
-                                # Some devices send in mV, others in different scales
-                                if isinstance(battery_voltage, (int, float)):
-                                    # Try different conversion methods
-                                    if battery_voltage > 1000:  # Likely in mV
-                                        voltage = float(battery_voltage) / 1000.0
-                                    elif battery_voltage > 100:  # Likely in 10mV units
-                                        voltage = float(battery_voltage) / 100.0
-                                    else:
-                                        voltage = float(battery_voltage)  # Already in V
+                        # The dedicated I/O checks below only apply when one of their ids is present
+                        if not detected_activity and not io_elements.keys().isdisjoint(FALLBACK_DETECTION_IOS):
+                            # Check for low internal battery (I/O 67 - Battery Voltage)
+                            battery_voltage = io_elements.get(67)
+                            if not detected_activity and battery_voltage is not None:
+                                try:
+                                    # Convert to voltage (Teltonika uses raw ADC values that need conversion)
+                                    # Some devices send in mV, others in different scales
+                                    if isinstance(battery_voltage, (int, float)):
+                                        voltage = _raw_to_volts(battery_voltage)
                                     
-                                    print(f"🔋 BATTERY VOLTAGE CHECK: Raw={battery_voltage}, Converted={voltage:.2f}V")
+                                        if debug_enabled:
+                                            parser_logger.debug(f"🔋 BATTERY VOLTAGE CHECK: Raw={battery_voltage}, Converted={voltage:.2f}V")
                                     
-                                    # More lenient battery check - even moderate drops are concerning
-                                    if voltage > 0 and voltage < 12.0:  # Less than 12V is worth reporting
-                                        detected_activity = 9  # LATRA Activity ID 9 (Internal Battery Low)
-                                        record["activity"] = f"9 - Internal Battery Low ({voltage:.2f}V)"
-                                        print(f"🔋 LOW BATTERY DETECTED: {voltage:.2f}V -> LATRA Activity 9")
-                                    elif voltage == 0:
-                                        # Zero voltage is definitely an issue
-                                        detected_activity = 9  # LATRA Activity ID 9 (Internal Battery Low)
-                                        record["activity"] = f"9 - Internal Battery Low (0V - No Reading)"
-                                        print(f"🔋 ZERO BATTERY VOLTAGE -> LATRA Activity 9")
-                                else:
-                                    print(f"🔋 BATTERY VOLTAGE: Non-numeric value {battery_voltage}, checking for low battery condition anyway")
-                                    # Even if we can't parse it, if I/O 67 is present, it might be a battery event
-                                    detected_activity = 9
-                                    record["activity"] = f"9 - Internal Battery Low (Unparseable: {battery_voltage})"
-                                    print(f"🔋 UNPARSEABLE BATTERY VALUE -> LATRA Activity 9")
+                                        # More lenient battery check - even moderate drops are concerning
+                                        if voltage > 0 and voltage < 12.0:  # Less than 12V is worth reporting
+                                            detected_activity = 9  # LATRA Activity ID 9 (Internal Battery Low)
+                                            record["activity"] = f"9 - Internal Battery Low ({voltage:.2f}V)"
+                                            if debug_enabled:
+                                                parser_logger.debug(f"🔋 LOW BATTERY DETECTED: {voltage:.2f}V -> LATRA Activity 9")
+                                        elif voltage == 0:
+                                            # Zero voltage is definitely an issue
+                                            detected_activity = 9  # LATRA Activity ID 9 (Internal Battery Low)
+                                            record["activity"] = f"9 - Internal Battery Low (0V - No Reading)"
+                                            if debug_enabled:
+                                                parser_logger.debug("🔋 ZERO BATTERY VOLTAGE -> LATRA Activity 9")
+                                    else:
+                                        if debug_enabled:
+                                            parser_logger.debug(f"🔋 BATTERY VOLTAGE: Non-numeric value {battery_voltage}, checking for low battery condition anyway")
+                                        # Even if we can't parse it, if I/O 67 is present, it might be a battery event
+                                        detected_activity = 9
+                                        record["activity"] = f"9 - Internal Battery Low (Unparseable: {battery_voltage})"
+                                        if debug_enabled:
+                                            parser_logger.debug("🔋 UNPARSEABLE BATTERY VALUE -> LATRA Activity 9")
                                     
-                            except (ValueError, TypeError) as e:
-                                print(f"DEBUG: Error parsing battery voltage {battery_voltage}: {e}")
-                                # Still report as battery event if I/O 67 is present
-                                detected_activity = 9
-                                record["activity"] = f"9 - Internal Battery Low (Parse Error: {battery_voltage})"
-                                print(f"🔋 BATTERY PARSE ERROR -> LATRA Activity 9")
+                                except (ValueError, TypeError) as e:
+                                    if debug_enabled:
+                                        parser_logger.debug(f"DEBUG: Error parsing battery voltage {battery_voltage}: {e}")
+                                    # Still report as battery event if I/O 67 is present
+                                    detected_activity = 9
+                                    record["activity"] = f"9 - Internal Battery Low (Parse Error: {battery_voltage})"
+                                    if debug_enabled:
+                                        parser_logger.debug("🔋 BATTERY PARSE ERROR -> LATRA Activity 9")
                         
-                        # Check for external power disconnection (I/O 66 - External Voltage)
-                        if not detected_activity and 66 in io_elements:
-                            ext_voltage = io_elements[66]
-                            try:
-                                # Convert to voltage (similar logic as battery)
-                                if isinstance(ext_voltage, (int, float)):
-                                    if ext_voltage > 1000:  # Likely in mV
-                                        voltage = float(ext_voltage) / 1000.0
-                                    elif ext_voltage > 100:  # Likely in 10mV units
-                                        voltage = float(ext_voltage) / 100.0
-                                    else:
-                                        voltage = float(ext_voltage)  # Already in V
+                            # Check for external power disconnection (I/O 66 - External Voltage)
+                            ext_voltage = io_elements.get(66)
+                            if not detected_activity and ext_voltage is not None:
+                                try:
+                                    # Convert to voltage (similar logic as battery)
+                                    if isinstance(ext_voltage, (int, float)):
+                                        voltage = _raw_to_volts(ext_voltage)
                                     
-                                    print(f"🔌 EXTERNAL VOLTAGE CHECK: Raw={ext_voltage}, Converted={voltage:.2f}V")
+                                        if debug_enabled:
+                                            parser_logger.debug(f"🔌 EXTERNAL VOLTAGE CHECK: Raw={ext_voltage}, Converted={voltage:.2f}V")
                                     
-                                    # External power disconnection check
-                                    if voltage == 0 or (voltage > 0 and voltage < 9.0):  # Less than 9V or 0V
-                                        detected_activity = 10  # LATRA Activity ID 10 (External Power Disconnected)
-                                        record["activity"] = f"10 - External Power Disconnected ({voltage:.2f}V)"
-                                        print(f"🔌 EXTERNAL POWER DISCONNECTED: {voltage:.2f}V -> LATRA Activity 10")
-                                else:
-                                    print(f"🔌 EXTERNAL VOLTAGE: Non-numeric value {ext_voltage}, checking for power disconnect anyway")
-                                    # Even if we can't parse it, if I/O 66 is present, it might be a power event
-                                    detected_activity = 10
-                                    record["activity"] = f"10 - External Power Disconnected (Unparseable: {ext_voltage})"
-                                    print(f"🔌 UNPARSEABLE EXTERNAL VOLTAGE -> LATRA Activity 10")
+                                        # External power disconnection check
+                                        if voltage == 0 or (voltage > 0 and voltage < 9.0):  # Less than 9V or 0V
+                                            detected_activity = 10  # LATRA Activity ID 10 (External Power Disconnected)
+                                            record["activity"] = f"10 - External Power Disconnected ({voltage:.2f}V)"
+                                            if debug_enabled:
+                                                parser_logger.debug(f"🔌 EXTERNAL POWER DISCONNECTED: {voltage:.2f}V -> LATRA Activity 10")
+                                    else:
+                                        if debug_enabled:
+                                            parser_logger.debug(f"🔌 EXTERNAL VOLTAGE: Non-numeric value {ext_voltage}, checking for power disconnect anyway")
+                                        # Even if we can't parse it, if I/O 66 is present, it might be a power event
+                                        detected_activity = 10
+                                        record["activity"] = f"10 - External Power Disconnected (Unparseable: {ext_voltage})"
+                                        if debug_enabled:
+                                            parser_logger.debug("🔌 UNPARSEABLE EXTERNAL VOLTAGE -> LATRA Activity 10")
                                     
-                            except (ValueError, TypeError) as e:
-                                print(f"DEBUG: Error parsing external voltage {ext_voltage}: {e}")
-                                # Still report as power disconnect event if I/O 66 is present
-                                detected_activity = 10
-                                record["activity"] = f"10 - External Power Disconnected (Parse Error: {ext_voltage})"
-                                print(f"🔌 EXTERNAL POWER PARSE ERROR -> LATRA Activity 10")
+                                except (ValueError, TypeError) as e:
+                                    if debug_enabled:
+                                        parser_logger.debug(f"DEBUG: Error parsing external voltage {ext_voltage}: {e}")
+                                    # Still report as power disconnect event if I/O 66 is present
+                                    detected_activity = 10
+                                    record["activity"] = f"10 - External Power Disconnected (Parse Error: {ext_voltage})"
+                                    if debug_enabled:
+                                        parser_logger.debug("🔌 EXTERNAL POWER PARSE ERROR -> LATRA Activity 10")
                         
-                        # Check for trip events (I/O 250 - Trip)
-                        if not detected_activity and 250 in io_elements:
-                            trip_state = io_elements[250]
-                            if trip_state == 1:  # Trip start
-                                detected_activity = 18  # LATRA Activity ID 18 (Engine Start)
-                                record["activity"] = "18 - Engine Start (Trip Start)"
-                                print(f"🚗 TRIP START DETECTED (I/O 250=1) -> LATRA Activity 18")
-                            elif trip_state == 0:  # Trip stop
-                                detected_activity = 19  # LATRA Activity ID 19 (Engine Stop)
-                                record["activity"] = "19 - Engine Stop (Trip Stop)"
-                                print(f"🛑 TRIP STOP DETECTED (I/O 250=0) -> LATRA Activity 19")
+                            # Check for trip events (I/O 250 - Trip)
+                            trip_state = io_elements.get(250)
+                            if not detected_activity and trip_state is not None:
+                                if trip_state == 1:  # Trip start
+                                    detected_activity = 18  # LATRA Activity ID 18 (Engine Start)
+                                    record["activity"] = "18 - Engine Start (Trip Start)"
+                                    if debug_enabled:
+                                        parser_logger.debug("🚗 TRIP START DETECTED (I/O 250=1) -> LATRA Activity 18")
+                                elif trip_state == 0:  # Trip stop
+                                    detected_activity = 19  # LATRA Activity ID 19 (Engine Stop)
+                                    record["activity"] = "19 - Engine Stop (Trip Stop)"
+                                    if debug_enabled:
+                                        parser_logger.debug("🛑 TRIP STOP DETECTED (I/O 250=0) -> LATRA Activity 19")
                         
-                        # Check for driver identification (I/O 78 - iButton or I/O 245 - Driver ID)
-                        if not detected_activity and (78 in io_elements or 245 in io_elements):
-                            # Check I/O 78 (iButton) first
-                            if 78 in io_elements:
-                                ibutton_id = io_elements[78]
-                                if ibutton_id and str(ibutton_id) != "0" and str(ibutton_id) != "0x0000000000000000":
-                                    detected_activity = 24  # LATRA Activity ID 24 (Ibutton Scan Regular)
-                                    record["activity"] = f"24 - Ibutton Scan (Regular) - iButton ID: {ibutton_id}"
-                                    print(f"👤 IBUTTON SCANNED (I/O 78): {ibutton_id} -> LATRA Activity 24")
-                                else:
-                                    detected_activity = 17  # LATRA Activity ID 17 (Invalid Scan)
-                                    record["activity"] = "17 - Invalid Scan (No iButton ID)"
-                                    print(f"❌ INVALID IBUTTON SCAN (I/O 78) -> LATRA Activity 17")
+                            # Check for driver identification (I/O 78 - iButton or I/O 245 - Driver ID)
+                            ibutton_id = io_elements.get(78)
+                            driver_id = io_elements.get(245)
+                            if not detected_activity and (ibutton_id is not None or driver_id is not None):
+                                # Check I/O 78 (iButton) first
+                                if ibutton_id is not None:
+                                    if ibutton_id and str(ibutton_id).upper() not in NO_IBUTTON_IDS:
+                                        detected_activity = 24  # LATRA Activity ID 24 (Ibutton Scan Regular)
+                                        record["activity"] = f"24 - Ibutton Scan (Regular) - iButton ID: {ibutton_id}"
+                                        if debug_enabled:
+                                            parser_logger.debug(f"👤 IBUTTON SCANNED (I/O 78): {ibutton_id} -> LATRA Activity 24")
+                                    else:
+                                        detected_activity = 17  # LATRA Activity ID 17 (Invalid Scan)
+                                        record["activity"] = "17 - Invalid Scan (No iButton ID)"
+                                        if debug_enabled:
+                                            parser_logger.debug("❌ INVALID IBUTTON SCAN (I/O 78) -> LATRA Activity 17")
                             
-                            # Check I/O 245 (Driver ID) if no I/O 78 or if I/O 78 was invalid
-                            elif 245 in io_elements:
-                                driver_id = io_elements[245]
-                                # Check if it's a valid driver ID (not empty, not all zeros, not FFFFFFFF)
-                                if (driver_id and str(driver_id) != "0" and 
-                                    str(driver_id) != "0x0000000000000000" and 
-                                    str(driver_id).upper() != "FFFFFFFFFFFFFFFF"):
-                                    detected_activity = 24  # LATRA Activity ID 24 (Ibutton Scan Regular)
-                                    record["activity"] = f"24 - Ibutton Scan (Regular) - Driver ID: {driver_id}"
-                                    print(f"👤 DRIVER ID SCANNED (I/O 245): {driver_id} -> LATRA Activity 24")
-                                else:
-                                    detected_activity = 17  # LATRA Activity ID 17 (Invalid Scan)
-                                    record["activity"] = "17 - Invalid Scan (No Driver ID)"
-                                    print(f"❌ INVALID DRIVER ID SCAN (I/O 245) -> LATRA Activity 17")
+                                # Check I/O 245 (Driver ID) if no I/O 78 or if I/O 78 was invalid
+                                elif driver_id is not None:
+                                    # Check if it's a valid driver ID (not empty, not all zeros, not FFFFFFFF)
+                                    if driver_id and str(driver_id).upper() not in NO_DRIVER_IDS:
+                                        detected_activity = 24  # LATRA Activity ID 24 (Ibutton Scan Regular)
+                                        record["activity"] = f"24 - Ibutton Scan (Regular) - Driver ID: {driver_id}"
+                                        if debug_enabled:
+                                            parser_logger.debug(f"👤 DRIVER ID SCANNED (I/O 245): {driver_id} -> LATRA Activity 24")
+                                    else:
+                                        detected_activity = 17  # LATRA Activity ID 17 (Invalid Scan)
+                                        record["activity"] = "17 - Invalid Scan (No Driver ID)"
+                                        if debug_enabled:
+                                            parser_logger.debug("❌ INVALID DRIVER ID SCAN (I/O 245) -> LATRA Activity 17")
                         
-                        # Check for panic button (I/O 200 - can be panic/emergency)
-                        if not detected_activity and 200 in io_elements:
-                            panic_state = io_elements[200]
-                            if panic_state == 1:
-                                detected_activity = 8  # LATRA Activity ID 8 (Panic Button Driver)
-                                record["activity"] = "8 - Panic Button (Driver)"
-                                print(f"🆘 PANIC BUTTON DETECTED (I/O 200=1) -> LATRA Activity 8")
+                            # Check for panic button (I/O 200 - can be panic/emergency)
+                            panic_state = io_elements.get(200)
+                            if not detected_activity and panic_state is not None:
+                                if panic_state == 1:
+                                    detected_activity = 8  # LATRA Activity ID 8 (Panic Button Driver)
+                                    record["activity"] = "8 - Panic Button (Driver)"
+                                    if debug_enabled:
+                                        parser_logger.debug("🆘 PANIC BUTTON DETECTED (I/O 200=1) -> LATRA Activity 8")
                         
                         # Check for jamming (I/O elements or specific conditions)
                         if not detected_activity:
                             # GPS Signal quality check
-                            gps_signal = record.get("satellites", 0)
-                            if gps_signal == 0 and (record.get("latitude", 0) == 0 and record.get("longitude", 0) == 0):
+                            if gps_signal_lost:
                                 detected_activity = 26  # LATRA Activity ID 26 (GPS Signal Lost)
                                 record["activity"] = "26 - GPS Signal Lost"
-                                print(f"📡 GPS SIGNAL LOST DETECTED -> LATRA Activity 26")
+                                if debug_enabled:
+                                    parser_logger.debug("📡 GPS SIGNAL LOST DETECTED -> LATRA Activity 26")
                         
                         # Default fallback - if we have ANY GPS data or I/O elements, use Movement/Logging
                         if not detected_activity:
                             # More inclusive fallback - ANY record should generate an activity
-                            if (record.get("latitude", 0) != 0 or record.get("longitude", 0) != 0 or 
-                                len(io_elements) > 0 or record.get("speed", 0) > 0):
+                            if io_elements or gps_valid or parsed_speed > 0:
                                 detected_activity = 1  # LATRA Activity ID 1 (Movement/Logging Default)
                                 record["activity"] = "1 - Movement/Logging (Default Data)"
-                                print(f"📊 DEFAULT ACTIVITY for data record -> LATRA Activity 1 (Movement/Logging)")
+                                if debug_enabled:
+                                    parser_logger.debug("📊 DEFAULT ACTIVITY for data record -> LATRA Activity 1 (Movement/Logging)")
                             
                             # Even if no GPS or I/O data, still send as basic logging event
                             elif not detected_activity:
                                 detected_activity = 15  # LATRA Activity ID 15 (Black Box Data Logging)
                                 record["activity"] = "15 - Black Box Data Logging"
-                                print(f"📋 BLACK BOX LOGGING (minimal data) -> LATRA Activity 15")
+                                if debug_enabled:
+                                    parser_logger.debug("📋 BLACK BOX LOGGING (minimal data) -> LATRA Activity 15")
                     
                     # Log final activity detection result
-                    if detected_activity:
-                        latra_activity_name = ""
-                        if detected_activity <= 50:  # Standard LATRA activities
-                            latra_activity_name = {
-                                1: "Movement/Logging (Default)", 2: "Engine ON", 3: "Engine OFF",
-                                4: "Speeding", 5: "Hash Braking", 6: "Hash Turning", 7: "Hash Acceleration",
-                                8: "Panic Button (Driver)", 9: "Internal Battery Low", 10: "External Power Disconnected",
-                                11: "Excessive Idle", 12: "Accident", 13: "Panic Button (Passenger)",
-                                14: "Device Tempering", 15: "Black Box Data Logging", 16: "Fuel data report",
-                                17: "Invalid Scan", 18: "Engine Start", 19: "Engine Stop",
-                                20: "Enter Boundary", 21: "Leave Boundary", 22: "Enter Checkpoint",
-                                23: "Leave Checkpoint", 24: "Ibutton Scan (Regular)"
-                            }.get(detected_activity, f"Activity {detected_activity}")
+                    if debug_enabled:
+                        if detected_activity:
+                            latra_activity_name = ""
+                            if detected_activity <= 50:  # Standard LATRA activities
+                                latra_activity_name = LATRA_ACTIVITY_NAMES.get(detected_activity, f"Activity {detected_activity}")
                         
-                        print(f"✅ FINAL LATRA ACTIVITY ID: {detected_activity} - {latra_activity_name}")
-                        print(f"📊 ACTIVITY SOURCE BREAKDOWN:")
-                        print(f"   - Event ID: {event_id} (0x{event_id:02X})")
-                        print(f"   - I/O 240 (Movement): {io_elements.get(240, 'N/A')}")
-                        print(f"   - I/O 239 (Ignition): {io_elements.get(239, 'N/A')}")
-                        print(f"   - Speed: {record.get('speed', 0)} km/h")
-                        print(f"   - GPS Valid: {record.get('latitude', 0) != 0 or record.get('longitude', 0) != 0}")
-                        print(f"🚀 RECORD WILL BE SENT TO LATRA with Activity ID {detected_activity}")
-                    else:
-                        print(f"❌ NO ACTIVITY DETECTED:")
-                        print(f"   - Event ID: {event_id} (0x{event_id:02X})")
-                        print(f"   - I/O 240 (Movement): {io_elements.get(240, 'N/A')}")
-                        print(f"   - I/O 239 (Ignition): {io_elements.get(239, 'N/A')}")
-                        print(f"   - Available I/O Elements: {list(io_elements.keys())}")
-                        print(f"⚠️ RECORD WILL BE SKIPPED FOR LATRA TRANSMISSION")
+                            parser_logger.debug("\n".join((
+                                f"✅ FINAL LATRA ACTIVITY ID: {detected_activity} - {latra_activity_name}",
+                                "📊 ACTIVITY SOURCE BREAKDOWN:",
+                                f"   - Event ID: {event_id} (0x{event_id:02X})",
+                                f"   - I/O 240 (Movement): {io_elements.get(240, 'N/A')}",
+                                f"   - I/O 239 (Ignition): {io_elements.get(239, 'N/A')}",
+                                f"   - Speed: {record.get('speed', 0)} km/h",
+                                f"   - GPS Valid: {gps_valid}",
+                                f"🚀 RECORD WILL BE SENT TO LATRA with Activity ID {detected_activity}",
+                            )))
+                        else:
+                            parser_logger.debug("\n".join((
+                                "❌ NO ACTIVITY DETECTED:",
+                                f"   - Event ID: {event_id} (0x{event_id:02X})",
+                                f"   - I/O 240 (Movement): {io_elements.get(240, 'N/A')}",
+                                f"   - I/O 239 (Ignition): {io_elements.get(239, 'N/A')}",
+                                f"   - I/O Elements: {len(io_elements)}",
+                                "⚠️ RECORD WILL BE SKIPPED FOR LATRA TRANSMISSION",
+                            )))
                     
                     # Store the LATRA activity ID for later use - ENSURE ALWAYS SET
                     if detected_activity is None:
                         # Ultimate failsafe - ALWAYS assign an activity ID
                         detected_activity = 1  # Default to Movement/Logging
                         record["activity"] = "1 - Movement/Logging (Ultimate Failsafe)"
-                        print(f"🔄 ULTIMATE FAILSAFE: Assigning Activity ID 1 (Movement/Logging)")
+                        if debug_enabled:
+                            parser_logger.debug("🔄 ULTIMATE FAILSAFE: Assigning Activity ID 1 (Movement/Logging)")
                     
                     record["latra_activity_id"] = detected_activity
                     
                     # GUARANTEE: Every record will now have a LATRA activity ID
-                    print(f"🎯 GUARANTEED ACTIVITY ID: {detected_activity} for transmission to LATRA")
+                    if debug_enabled:
+                        parser_logger.debug(f"🎯 GUARANTEED ACTIVITY ID: {detected_activity} for transmission to LATRA")
 
                     result["records"].append(record)
 
@@ -1217,408 +1616,120 @@ class GPSListener:
             result["parse_errors"].append(f"Fatal parsing error: {str(e)}")
 
         # Final summary of all parsed records
-        print(f"\n🏁 PARSING COMPLETE SUMMARY:")
-        print(f"   📊 Total Records Parsed: {len(result['records'])}")
-        for i, record in enumerate(result['records']):
-            activity_id = record.get('latra_activity_id', 'None')
-            activity_desc = record.get('activity', 'No activity')
-            event_id = record.get('event_id', 0)
-            print(f"   📄 Record {i+1}: Activity ID {activity_id} - {activity_desc} (Event ID: {event_id})")
+        if debug_enabled:
+            lines = ["🏁 PARSING COMPLETE SUMMARY:", f"   📊 Total Records Parsed: {len(result['records'])}"]
+            for i, record in enumerate(result['records']):
+                activity_id = record.get('latra_activity_id', 'None')
+                activity_desc = record.get('activity', 'No activity')
+                event_id = record.get('event_id', 0)
+                lines.append(f"   📄 Record {i+1}: Activity ID {activity_id} - {activity_desc} (Event ID: {event_id})")
+            lines.append("🎯 ALL RECORDS WILL BE SENT TO LATRA (No filtering by activity)")
+            parser_logger.debug("\n".join(lines))
         
-        if result.get("parse_errors"):
-            print(f"   ❌ Parse Errors: {len(result['parse_errors'])}")
-            for error in result["parse_errors"]:
-                print(f"      - {error}")
+        if result["parse_errors"]:
+            parser_logger.warning(
+                "%d parse errors for IMEI %s: %s",
+                len(result["parse_errors"]), device_imei, "; ".join(result["parse_errors"]),
+            )
         
-        print(f"🎯 ALL RECORDS WILL BE SENT TO LATRA (No filtering by activity)\n")
-
         return result
 
     def coordinate_formater(self, hex_coordinate):
         """Convert hex coordinate to decimal degrees"""
         try:
-            if not hex_coordinate or hex_coordinate == "00000000":
-                print(f"DEBUG: Empty or zero coordinate hex: {hex_coordinate}")
-                return 0.0
-                
-            coordinate = self.safe_hex_to_int(hex_coordinate)
-            print(f"DEBUG: Raw coordinate int: {coordinate}")
-            
-            if coordinate == 0:
-                print(f"DEBUG: Zero coordinate detected")
+            if not hex_coordinate:
                 return 0.0
-                
-            if coordinate & (1 << 31):
-                new_int = coordinate - 2 ** 32
-                dec_coordinate = new_int / 1e7
-                print(f"DEBUG: Negative coordinate - Raw: {coordinate}, Converted: {new_int}, Final: {dec_coordinate}")
-            else:
-                dec_coordinate = coordinate / 10000000
-                print(f"DEBUG: Positive coordinate - Raw: {coordinate}, Final: {dec_coordinate}")
-            return dec_coordinate
-        except Exception as e:
-            print(f"DEBUG: Coordinate parsing error: {e} for hex: {hex_coordinate}")
+            coordinate = int(hex_coordinate, 16)
+            if coordinate & 0x80000000:
+                coordinate -= 0x100000000
+            return coordinate / 1e7
+        except (TypeError, ValueError) as e:
+            parser_logger.debug("Coordinate parsing error: %s for hex: %s", e, hex_coordinate)
             return 0.0
 
     def time_stamper_for_json(self):
         """Generate timestamp string for JSON output"""
-        current_server_time = datetime.datetime.now()
-        timestamp_utc = datetime.datetime.utcnow()
-        return f"{current_server_time.strftime('%H:%M:%S %d-%m-%Y')} (local) / {timestamp_utc.strftime('%H:%M:%S %d-%m-%Y')} (utc)"
+        return _format_local_utc(time.time())
 
     def device_time_stamper(self, timestamp):
-        """Convert device timestamp to readable format"""
+        """Convert a device timestamp (epoch ms) to readable format"""
         try:
-            timestamp_ms = self.safe_hex_to_int(timestamp) / 1000
-            timestamp_utc = datetime.datetime.utcfromtimestamp(timestamp_ms)
-            utc_offset = datetime.datetime.fromtimestamp(timestamp_ms) - datetime.datetime.utcfromtimestamp(timestamp_ms)
-            timestamp_local = timestamp_utc + utc_offset
-            formatted_timestamp_local = timestamp_local.strftime("%H:%M:%S %d-%m-%Y")
-            formatted_timestamp_utc = timestamp_utc.strftime("%H:%M:%S %d-%m-%Y")
-            return f"{formatted_timestamp_local} (local) / {formatted_timestamp_utc} (utc)"
+            # The format has second resolution, so whole seconds are the cache key
+            return _format_device_time(timestamp // 1000)
         except Exception:
             return "INVALID_TIMESTAMP"
 
     def record_delay_counter(self, timestamp):
-        """Calculate delay between device timestamp and server time"""
+        """Calculate delay between device timestamp (epoch ms) and server time"""
         try:
-            timestamp_ms = self.safe_hex_to_int(timestamp) / 1000
-            current_server_time = datetime.datetime.now().timestamp()
-            return f"{int(current_server_time - timestamp_ms)} seconds"
+            return f"{int(time.time() - timestamp / 1000)} seconds"
         except Exception:
             return "INVALID_DELAY"
 
     def get_io_activity_description(self, io_id, io_value, latra_activity_id):
         """Generate detailed activity description for I/O elements"""
-        
-        # Special handling for specific I/O elements
-        if io_id == 250:  # Trip Start/Stop
-            if io_value == 1:
-                return "Engine Start (Trip Start)"
-            elif io_value == 0:
-                return "Engine Stop (Trip Stop)"
-            else:
-                return f"Trip Event (Value: {io_value})"
-                
-        elif io_id == 239:  # Ignition
-            if io_value == 1:
-                return "Engine ON (Ignition)"
-            elif io_value == 0:
-                return "Engine OFF (Ignition)"
-            else:
-                return f"Ignition Event (Value: {io_value})"
-                
-        elif io_id == 240:  # Movement
-            if io_value == 1:
-                return "Movement/Logging (Movement ON)"
-            elif io_value == 0:
-                return "Movement/Logging (Movement STOP)"
-            else:
-                return f"Movement Event (Value: {io_value})"
-                
-        elif io_id in [67, 113]:  # Battery voltage/level
-            return f"Internal Battery Low (Battery: {io_value})"
-            
-        elif io_id in [66, 65, 114]:  # External power
-            return f"External Power Disconnected (Voltage: {io_value})"
-            
-        elif io_id in [72, 73, 74, 75, 32, 39]:  # Temperature sensors
-            return f"High Temperature Alert (Temp: {io_value})"
-            
-        elif io_id in [201, 202, 203, 204, 207, 208, 209, 210, 212, 213, 214, 215]:  # Fuel data
-            return f"Fuel data report (Fuel: {io_value})"
-            
-        elif io_id in [211, 84, 89]:  # Low fuel
-            return f"Low Fuel Alert (Fuel Level: {io_value})"
-            
-        elif io_id in [78, 403, 404, 405, 406, 407]:  # Driver ID
-            return f"Ibutton Scan (Regular) (Driver ID: {io_value})"
-            
-        elif io_id in [408, 409]:  # Invalid driver
-            return f"Invalid Scan (Driver Issue: {io_value})"
-            
-        elif io_id in range(155, 232):  # Geofence zones
-            zone_num = ((io_id - 155) // 2) + 1
-            if io_id % 2 == 1:  # Odd = Enter
-                return f"Enter Boundary (Zone {zone_num}: {io_value})"
-            else:  # Even = Exit
-                return f"Leave Boundary (Zone {zone_num}: {io_value})"
-                
-        elif io_id in [1, 2, 3, 379]:  # Digital inputs
-            return f"Door Open/Close (Input {io_id}: {io_value})"
-            
-        elif io_id in [179, 180, 380]:  # Digital outputs
-            return f"Door Open/Close (Output {io_id}: {io_value})"
-            
-        elif io_id == 381:  # Ground sense
-            return f"Device Tempering (Ground Sense: {io_value})"
-            
-        elif io_id in [252]:  # Battery unplug
-            return f"Internal Battery Low (Battery Unplugged: {io_value})"
-            
-        elif io_id == 246:  # Towing
-            return f"Vehicle Theft (Towing Detected: {io_value})"
-            
-        elif io_id == 247:  # Crash
-            return f"Accident (Crash Detection: {io_value})"
-            
-        elif io_id == 255:  # Over speeding
-            return f"Speeding (Over Speed Event: {io_value})"
-            
-        elif io_id in [253, 17, 18, 19]:  # Accelerometer
-            if io_id == 253 or io_id == 19:
-                return f"Hash Braking (Z-Axis: {io_value})"
-            elif io_id == 17:
-                return f"Hash Acceleration (X-Axis: {io_value})"
-            elif io_id == 18:
-                return f"Hash Turning (Y-Axis: {io_value})"
-                
-        elif io_id in [318, 249]:  # Jamming
-            return f"GPS Signal Lost (Jamming: {io_value})"
-            
-        elif io_id == 251:  # Idling
-            return f"Excessive Idle (Idling: {io_value})"
-            
-        elif io_id >= 10800 and io_id <= 10833:  # EYE sensors
-            if io_id <= 10805:
-                return f"High Temperature Alert (EYE Temp {io_id-10799}: {io_value})"
-            elif io_id >= 10820 and io_id <= 10825:
-                return f"Internal Battery Low (EYE Battery {io_id-10819}: {io_value})"
-            elif io_id >= 10830:
-                return f"Movement/Logging (EYE Movement {io_id-10829}: {io_value})"
-            else:
-                return f"EYE Sensor Event (ID {io_id}: {io_value})"
-                
-        elif io_id >= 10500 and io_id <= 10523:  # WSN sensors
-            if io_id <= 10505:
-                return f"High Temperature Alert (WSN Temp {io_id-10499}: {io_value})"
-            elif io_id >= 10510 and io_id <= 10515:
-                return f"Internal Battery Low (WSN Battery {io_id-10509}: {io_value})"
-            elif io_id >= 10520:
-                return f"Door Open/Close (WSN Door {io_id-10519}: {io_value})"
-            else:
-                return f"WSN Sensor Event (ID {io_id}: {io_value})"
-        
-        # OBD-II parameters
-        elif io_id >= 30 and io_id <= 57:
-            if io_id in [30, 31, 40, 42, 43, 47, 49]:
-                return f"Black Box Data Logging (OBD {io_id}: {io_value})"
-            elif io_id in [32, 39, 45]:
-                return f"High Temperature Alert (OBD Temp {io_id}: {io_value})"
-            elif io_id in [34, 35, 36, 41, 50, 52, 53]:
-                return f"Fuel data report (OBD Fuel {io_id}: {io_value})"
-            elif io_id in [33, 44, 51, 54, 55]:
-                return f"Maintenance Alert (OBD {io_id}: {io_value})"
-            elif io_id == 46:
-                return f"Internal Battery Low (OBD Voltage: {io_value})"
-            else:
-                return f"OBD Parameter (ID {io_id}: {io_value})"
-        
-        # CAN Bus parameters
-        elif io_id >= 80 and io_id <= 100:
-            if io_id in [80, 86, 87, 88, 91, 95, 96, 97, 99, 100]:
-                return f"Black Box Data Logging (CAN {io_id}: {io_value})"
-            elif io_id in [82, 98]:
-                return f"High Temperature Alert (CAN Temp {io_id}: {io_value})"
-            elif io_id == 83:
-                return f"Fuel data report (CAN Fuel Consumed: {io_value})"
-            elif io_id in [84, 89]:
-                return f"Low Fuel Alert (CAN Fuel Level: {io_value})"
-            elif io_id == 85:
-                return f"Movement/Logging (CAN Distance: {io_value})"
-            elif io_id == 90:
-                return f"Speeding (CAN Wheel Speed: {io_value})"
-            elif io_id in [92, 93]:
-                return f"Excessive Idle (CAN {io_id}: {io_value})"
-            elif io_id == 94:
-                return f"Maintenance Alert (CAN Service Distance: {io_value})"
-            else:
-                return f"CAN Parameter (ID {io_id}: {io_value})"
-        
-        # Generic descriptions based on LATRA activity ID
-        latra_activities = {
-            1: "Movement/Logging", 2: "Engine ON", 3: "Engine OFF",
-            4: "Speeding", 5: "Hash Braking", 6: "Hash Turning", 7: "Hash Acceleration",
-            8: "Panic Button (Driver)", 9: "Internal Battery Low", 10: "External Power Disconnected",
-            11: "Excessive Idle", 12: "Accident", 13: "Panic Button (Passenger)",
-            14: "Device Tempering", 15: "Black Box Data Logging", 16: "Fuel data report",
-            17: "Invalid Scan", 18: "Engine Start", 19: "Engine Stop",
-            20: "Enter Boundary", 21: "Leave Boundary", 22: "Enter Checkpoint",
-            23: "Leave Checkpoint", 24: "Ibutton Scan (Regular)", 25: "Reserved",
-            26: "GPS Signal Lost", 27: "GPS Signal Restored", 28: "Reserved",
-            29: "Reserved", 30: "Reserved", 31: "Driver Identification",
-            32: "Reserved", 33: "Vehicle Theft", 34: "Maintenance Alert",
-            35: "Reserved", 36: "Low Fuel Alert", 37: "High Temperature Alert",
-            38: "Reserved", 39: "Door Open/Close", 40: "Reserved"
-        }
-        
-        activity_name = latra_activities.get(latra_activity_id, f"Activity {latra_activity_id}")
-        return f"{activity_name} (I/O {io_id}: {io_value})"
+        return _io_activity_description(io_id, io_value, latra_activity_id)
 
     def display_activity_specific_data(self, activity_code, record):
-        """Display specific information based on activity code"""
-        io_elements = record.get("io_elements", {})
-        
-        if activity_code == 3:  # Engine OFF
-            print("\nENGINE OFF EVENT DETAILS:")
-            print(f"Event Time: {record.get('timestamp', 'N/A')}")
-            print(f"Location: {record.get('latitude', 'N/A')}, {record.get('longitude', 'N/A')}")
-            print(f"Speed at shutdown: {record.get('speed', 'N/A')} km/h")
-            print(f"Distance travelled: {io_elements.get(239, 'N/A')} km")
-            print(f"Trip duration: {io_elements.get(80, 'N/A')} minutes")
-            print(f"Average speed: {io_elements.get(241, 'N/A')} km/h")
-            print(f"Max speed: {io_elements.get(242, 'N/A')} km/h")
-            print(f"GPS Satellites: {record.get('satellites', 'N/A')}")
-            print(f"Engine Hours: {io_elements.get(80, 'N/A')}")
-            print(f"Fuel Level: {io_elements.get(16, 'N/A')}%")
-            print(f"Battery Voltage: {io_elements.get(66, 'N/A')}V")
-        
-        elif activity_code == 2:  # Engine ON
-            print("\nENGINE ON EVENT DETAILS:")
-            print(f"Idle Time: {io_elements.get(11, 'N/A')} seconds")
-            print(f"Driver ID: {io_elements.get(245, 'N/A')}")
-        
-        elif activity_code in (9, 10):  # Battery/Power events
-            print("\nPOWER EVENT DETAILS:")
-            print(f"External Power Voltage: {io_elements.get(67, 'N/A')}V")
-            print(f"Internal Battery Voltage: {io_elements.get(66, 'N/A')}V")
-        
-        elif activity_code in (17, 24):  # Driver identification events
-            print("\nDRIVER IDENTIFICATION DETAILS:")
-            driver_id = io_elements.get(245, 'N/A')
-            if isinstance(driver_id, str) and driver_id.startswith('0x'):
-                driver_id = driver_id[2:]
-            print(f"Driver ID (16-digit hex): {driver_id}")
-        
-        elif activity_code == 16:  # Fuel data report
-            print("\nFUEL DATA REPORT DETAILS:")
-            print(f"Data Valid Flag: {io_elements.get(250, 'N/A')} (0=valid)")
-            print(f"Signal Sensitivity: {io_elements.get(251, 'N/A')}/99")
-            print(f"Software Status: {io_elements.get(252, 'N/A')} (0=normal)")
-            
-            hw_fault_code = io_elements.get(253, 0)
-            hw_fault_desc = HARDWARE_FAULT_CODES.get(hw_fault_code, "Unknown fault")
-            print(f"Hardware Fault: {hw_fault_code} - {hw_fault_desc}")
-            
-            print(f"Fuel Level (smoothed): {io_elements.get(16, 'N/A')} mm")
-            print(f"Real-time Fuel Level: {io_elements.get(254, 'N/A')} mm")
-            
-            temp_raw = io_elements.get(255, 0)
-            temp_celsius = float(temp_raw) / 10 if isinstance(temp_raw, (int, float)) else 'N/A'
-            print(f"Tank Temperature: {temp_celsius}°C")
-            
-            print(f"Fuel Tank Compartment: {io_elements.get(256, 1)}")
+        """Log specific information based on activity code (DEBUG level only)"""
+        if not parser_logger.isEnabledFor(logging.DEBUG):
+            return
+
+        template = ACTIVITY_DETAIL_TEMPLATES.get(activity_code)
+        if template is not None:
+            io_elements = record.get("io_elements", {})
+            fields = {}
+            if activity_code in (17, 24):  # Driver identification events
+                driver_id = io_elements.get(245, 'N/A')
+                if isinstance(driver_id, str) and driver_id.startswith('0x'):
+                    driver_id = driver_id[2:]
+                fields["driver_id"] = driver_id
+            elif activity_code == 16:  # Fuel data report
+                hw_fault_code = io_elements.get(253, 0)
+                temp_raw = io_elements.get(255, 0)
+                fields["hw_fault_code"] = hw_fault_code
+                fields["hw_fault_desc"] = HARDWARE_FAULT_CODES.get(hw_fault_code, "Unknown fault")
+                fields["temp_celsius"] = float(temp_raw) / 10 if isinstance(temp_raw, (int, float)) else 'N/A'
+                fields["channel"] = io_elements.get(256, 1)
+            parser_logger.debug(template.format(rec=_DetailFields(record), io=_DetailFields(io_elements), **fields))
         
-        print("END OF ACTIVITY DETAILS\n")
+        parser_logger.debug("END OF ACTIVITY DETAILS")
 
     def sorting_hat(self, key, value):
         """Parse I/O element based on its ID"""
-        parse_functions = {
-            240: lambda x: self.safe_hex_to_int(x),
-            239: lambda x: self.safe_hex_to_int(x),
-            80: lambda x: self.safe_hex_to_int(x),
-            241: lambda x: float(decimal.Decimal(self.safe_hex_to_int(x)) * decimal.Decimal('0.1')),
-            242: lambda x: float(decimal.Decimal(self.safe_hex_to_int(x)) * decimal.Decimal('0.1')),
-            11: lambda x: self.safe_hex_to_int(x),
-            245: lambda x: x if x else "FFFFFFFFFFFFFFFF",  # Keep raw hex for driver ID
-            66: lambda x: float(decimal.Decimal(self.safe_hex_to_int(x)) * decimal.Decimal('0.01')),
-            67: lambda x: float(decimal.Decimal(self.safe_hex_to_int(x)) * decimal.Decimal('0.01')),
-            16: lambda x: self.safe_hex_to_int(x),
-            250: lambda x: self.safe_hex_to_int(x),
-            251: lambda x: self.safe_hex_to_int(x),
-            252: lambda x: self.safe_hex_to_int(x),
-            253: lambda x: self.safe_hex_to_int(x),
-            254: lambda x: self.safe_hex_to_int(x),
-            255: lambda x: self.safe_hex_to_int(x),
-            256: lambda x: self.safe_hex_to_int(x),
-            21: lambda x: self.safe_hex_to_int(x),
-            200: lambda x: self.safe_hex_to_int(x),
-            69: lambda x: self.safe_hex_to_int(x),
-            181: lambda x: float(decimal.Decimal(self.safe_hex_to_int(x)) * decimal.Decimal('0.1')),
-            182: lambda x: float(decimal.Decimal(self.safe_hex_to_int(x)) * decimal.Decimal('0.1')),
-            24: lambda x: self.safe_hex_to_int(x),
-            205: lambda x: self.safe_hex_to_int(x),
-            206: lambda x: self.safe_hex_to_int(x),
-            68: lambda x: float(decimal.Decimal(self.safe_hex_to_int(x)) * decimal.Decimal('0.001')),
-            299: lambda x: self.safe_hex_to_int(x),
-            1: lambda x: self.safe_hex_to_int(x),
-            9: lambda x: self.safe_hex_to_int(x),
-            179: lambda x: self.safe_hex_to_int(x),
-            12: lambda x: float(decimal.Decimal(self.safe_hex_to_int(x)) * decimal.Decimal('0.001')),
-            13: lambda x: float(decimal.Decimal(self.safe_hex_to_int(x)) * decimal.Decimal('0.01')),
-            17: lambda x: struct.unpack(">i", bytes.fromhex(x.zfill(8)))[0] if x else 0,
-            18: lambda x: struct.unpack(">i", bytes.fromhex(x.zfill(8)))[0] if x else 0,
-            19: lambda x: struct.unpack(">i", bytes.fromhex(x.zfill(8)))[0] if x else 0,
-            10: lambda x: self.safe_hex_to_int(x),
-            2: lambda x: self.safe_hex_to_int(x),
-            3: lambda x: self.safe_hex_to_int(x),
-            6: lambda x: float(decimal.Decimal(self.safe_hex_to_int(x)) * decimal.Decimal('0.001')),
-            180: lambda x: self.safe_hex_to_int(x)
-        }
-
         try:
-            if key in parse_functions:
-                return parse_functions[key](value)
+            if key in IO_PARSE_INT:
+                return _hex_to_int(value)
+            divisor = IO_PARSE_SCALED.get(key)
+            if divisor is not None:
+                return _parse_scaled(value, divisor)
+            if key in IO_PARSE_SIGNED32:
+                return _parse_s32(value)
+            if key in IO_PARSE_RAW_HEX:
+                return value if value else "FFFFFFFFFFFFFFFF"  # Keep raw hex for driver ID
             return f"0x{value}"
         except Exception:
             return f"0x{value}"
 
+    def parse_driver_id(self, hex_value):
+        """Normalise a driver/iButton ID to a 16-digit uppercase hex string"""
+        return _parse_driver_id(hex_value)
+
     def get_addon_info_for_activity(self, activity_id, io_elements):
         """Generate addon_info based on activity ID"""
+        fields = ACTIVITY_ADDON_FIELDS.get(activity_id, ())
+        populate = ADDON_BUILDERS.get(activity_id)
+        if not fields and populate is None:
+            return None
+
         addon_info = {}
-        
-        if activity_id == 2:  # Engine ON / Trip Start
-            if 11 in io_elements:  # Idle time
-                addon_info["idleTime"] = str(io_elements[11])
-            
-            if 245 in io_elements:  # Driver identification
-                driver_id = io_elements[245]
-                # Convert to 16-digit hex string if needed
-                if isinstance(driver_id, str) and driver_id.startswith('0x'):
-                    driver_id = driver_id[2:].upper().zfill(16)
-                elif isinstance(driver_id, int):
-                    driver_id = f"{driver_id:016X}"
-                else:
-                    driver_id = str(driver_id).upper().zfill(16)
-                addon_info["v_driver_identification_no"] = driver_id
-                
-        elif activity_id == 3:  # Engine OFF / Trip End
-            if 239 in io_elements:  # Distance travelled
-                addon_info["distance_travelled"] = str(io_elements[239])
-            
-            if 80 in io_elements:  # Trip duration
-                addon_info["trip_duration"] = str(io_elements[80])
-            
-            if 241 in io_elements:  # Average speed
-                addon_info["avgSpeed"] = str(io_elements[241])
-            
-            if 242 in io_elements:  # Max speed
-                addon_info["maxSpeed"] = str(io_elements[242])
-                
-        elif activity_id in [9, 10]:  # Power status events
-            if 67 in io_elements:  # External power voltage
-                addon_info["ext_power_voltage"] = str(io_elements[67])
-            
-            if 66 in io_elements:  # Internal battery voltage
-                addon_info["int_battery_voltage"] = str(io_elements[66])
-                
-        elif activity_id in [17, 24]:  # Invalid Scan and Regular Ibutton Scan
-            if 245 in io_elements:  # Driver identification
-                driver_id = io_elements[245]
-                # Convert to 16-digit hex string if needed
-                if isinstance(driver_id, str) and driver_id.startswith('0x'):
-                    driver_id = driver_id[2:].upper().zfill(16)
-                elif isinstance(driver_id, int):
-                    driver_id = f"{driver_id:016X}"
-                else:
-                    driver_id = str(driver_id).upper().zfill(16)
-                    
-                # Use FFFFFFFFFFFFFFFF when no valid identification detected
-                if not driver_id or driver_id == "0000000000000000":
-                    driver_id = "FFFFFFFFFFFFFFFF"
-                    
-                addon_info["v_driver_identification_no"] = driver_id
-        
+        get_io = io_elements.get
+        for io_id, key in fields:
+            value = get_io(io_id)
+            if value is not None:
+                addon_info[key] = str(value)
+        if populate is not None:
+            populate(addon_info, io_elements)
         return addon_info if addon_info else None
 
     def get_fuel_info_for_activity(self, activity_id, io_elements):
@@ -1627,425 +1738,329 @@ class GPSListener:
             return None
             
         fuel_info = {}
+        if not io_elements.keys().isdisjoint(FUEL_INFO_IOS):
+            get_io = io_elements.get
+            for io_id, key in FUEL_INFO_FIELDS:
+                value = get_io(io_id)
+                if value is not None:
+                    fuel_info[key] = str(value)
         
-        if 250 in io_elements:  # Data valid flag
-            fuel_info["validFlag"] = str(io_elements[250])
-        
-        if 251 in io_elements:  # Signal sensitivity
-            fuel_info["signalLevel"] = str(io_elements[251])
-        
-        if 252 in io_elements:  # Software status
-            fuel_info["softStatus"] = str(io_elements[252])
-        
-        if 253 in io_elements:  # Hardware fault code
-            fuel_info["hardFault"] = str(io_elements[253])
-        
-        if 16 in io_elements:  # Fuel level (smoothed)
-            fuel_info["fuelLevel"] = str(io_elements[16])
-        
-        if 254 in io_elements:  # Real-time fuel level
-            fuel_info["rtFuelLevel"] = str(io_elements[254])
-        
-        if 255 in io_elements:  # Tank temperature (already multiplied by 10)
-            fuel_info["tankTemp"] = str(io_elements[255])
-        
-        if 256 in io_elements:  # Fuel tank compartment
-            fuel_info["channel"] = str(io_elements[256])
-        else:
-            fuel_info["channel"] = "1"  # Default value
-        
-        return fuel_info if fuel_info else None
+        fuel_info.setdefault("channel", "1")  # Default fuel tank compartment
+        return fuel_info
+
+    def extract_activity_extras(self, activity_id, io_elements):
+        """Return (addon_info, fuel_info) for an activity; at most one of them is set"""
+        # Fuel reports (16) carry no addon fields, so only one table is ever consulted
+        if activity_id == 16:
+            return None, self.get_fuel_info_for_activity(activity_id, io_elements)
+        return self.get_addon_info_for_activity(activity_id, io_elements), None
 
     def generate_dynamic_mgs_id(self):
         """Generate dynamic MGS_ID with incrementing counter and timestamp"""
-        import random
-        
         # Increment counter and reset if it gets too high
-        self.mgs_id_counter += 1
-        if self.mgs_id_counter > 99999:
-            self.mgs_id_counter = 10000
-        
-        # Add some randomness based on current time
-        timestamp_part = int(time.time()) % 10000  # Last 4 digits of timestamp
-        random_part = random.randint(100, 999)  # 3-digit random number
+        self.mgs_id_counter = self.mgs_id_counter + 1 if self.mgs_id_counter < 99999 else 10000
         
-        # Combine counter with timestamp and random parts
-        dynamic_id = f"{self.mgs_id_counter}{timestamp_part % 100}{random_part % 100}"
+        # Counter + last 2 digits of the current second + 2 random digits
+        dynamic_id = f"{self.mgs_id_counter}{int(time.time()) % 100}{random.randrange(100)}"
         
         return dynamic_id[:8]  # Ensure it's not too long
 
+    def queue_for_latra(self, vehicle, data):
+        """Queue parsed data for a batched LATRA upload; the Future resolves to (success, response)"""
+        future = Future()
+        self.latra_queue.put((vehicle, data, future))
+        # (Re)start the batcher after queueing, so a replacement thread also drains this packet
+        if self.latra_batcher is None or not self.latra_batcher.is_alive():
+            with self.latra_batcher_lock:
+                if self.latra_batcher is None or not self.latra_batcher.is_alive():
+                    self.latra_batcher = threading.Thread(
+                        target=self.latra_batch_worker, name="latra-batcher", daemon=True
+                    )
+                    self.latra_batcher.start()
+        return future
+
+    def latra_batch_worker(self):
+        """Take queued packets as they arrive and send one POST per vehicle"""
+        while True:
+            batch = [self.latra_queue.get()]
+            # Coalesce only what is already queued (packets that arrived while the last batch was
+            # dispatched); a lone packet is sent at once instead of waiting for company
+            while True:
+                try:
+                    batch.append(self.latra_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            groups = {}
+            for entry in batch:
+                try:
+                    imei_number = entry[0].imei.imei_number
+                except Exception as e:
+                    logger.error("Cannot queue packet for LATRA: %s", e)
+                    self.fail_latra_entries([entry], e)
+                    continue
+                groups.setdefault(imei_number, []).append(entry)
+            for entries in groups.values():
+                self.send_latra_group(entries)
+
+    def send_latra_group(self, entries):
+        """Start one LATRA upload for a vehicle's queued packets and resolve their futures when it completes"""
+        try:
+            vehicle, data, _ = entries[0]
+            if len(entries) > 1:
+                data = {"records": [record for _, packet, _ in entries for record in packet['records']]}
+                logger.debug("Coalesced %d packets for IMEI %s into one LATRA upload", len(entries), vehicle.imei.imei_number)
+            merged = {"packets": len(entries), "records": len(data['records'])} if len(entries) > 1 else None
+
+            def resolve(upload):
+                try:
+                    success, response = upload.result()
+                except Exception as e:
+                    success, response = False, {"error": str(e)}
+                if merged is not None:
+                    # Each packet's ReportedData row gets this response: say it covers the merged upload
+                    response = {"merged_upload": merged, "response": response}
+                for _, _, future in entries:
+                    if not future.done():
+                        future.set_result((success, response))
+
+            # Payload building and the POST both run on the upload pool, never on the batcher thread
+            self.send_to_latra_async(vehicle, data).add_done_callback(resolve)
+        except Exception as e:
+            logger.error("Error starting LATRA upload for %d packets: %s", len(entries), e)
+            self.fail_latra_entries(entries, e)
+
+    def fail_latra_entries(self, entries, error):
+        """Resolve the futures of queued packets that could not be uploaded"""
+        for _, _, future in entries:
+            if not future.done():
+                future.set_result((False, {"error": str(error)}))
+
     def send_to_latra(self, vehicle, data):
-        """Send data to LATRA API with retry logic and activity-specific addon_info"""
-        max_retries = 3
-        retry_delay = 1  # seconds
-        
-        for attempt in range(max_retries):
-            try:
-                # Prepare payload for each record
-                items = []
-                for record in data['records']:
-                    try:
-                        # Parse timestamp from the format "HH:MM:SS DD-MM-YYYY (local) / HH:MM:SS DD-MM-YYYY (utc)"
-                        timestamp_str = record["timestamp"].split(" (")[0]
-                        try:
-                            timestamp = int(datetime.datetime.strptime(
-                                timestamp_str, 
-                                "%H:%M:%S %d-%m-%Y"
-                            ).timestamp() * 1000)
-                            
-                            # Validate timestamp (should be reasonable)
-                            current_time = int(time.time() * 1000)
-                            if timestamp <= 0 or timestamp > current_time + (24 * 60 * 60 * 1000):  # Not in future by more than 1 day
-                                print(f"Warning: Invalid timestamp {timestamp}, using current time")
-                                timestamp = current_time
-                                
-                        except Exception as e:
-                            print(f"Error parsing timestamp {timestamp_str}: {e}, using current time")
-                            timestamp = int(time.time() * 1000)
-                        
-                        # Extract activity ID from stored LATRA activity ID (already mapped)
-                        io_elements = record.get("io_elements", {})
-                        event_id = record.get("event_id", 0)
-                        
-                        # Use the pre-calculated LATRA activity ID from parsing
-                        activity_id = record.get("latra_activity_id")
-                        activity_source = "none"
-                        
-                        # Fallback logic if latra_activity_id is not set
-                        if activity_id is None:
-                            # Primary: Use Event ID field and map to LATRA activity
-                            if event_id and event_id != 0:
-                                latra_mapping = ACTIVITY_CODES.get(event_id)
-                                if latra_mapping and isinstance(latra_mapping, str) and latra_mapping.isdigit():
-                                    activity_id = int(latra_mapping)
-                                else:
-                                    activity_id = event_id  # Use Event ID directly if no mapping
-                                activity_source = "Event ID"
-                                print(f"DEBUG: Fallback - Using Event ID as activity: {activity_id}")
-                            
-                            # Secondary: Use I/O 240 (Movement) -> LATRA Activity 1
-                            elif 240 in io_elements:
-                                activity_id = 1  # LATRA Movement/Logging activity
-                                activity_source = "I/O 240 (Movement)"
-                                movement_state = io_elements[240]
-                                print(f"DEBUG: Fallback - Using I/O 240 as activity: {activity_id}, state: {movement_state}")
-                            
-                            # Tertiary: Use I/O 239 (Ignition) -> LATRA Activity 2/3
-                            elif 239 in io_elements:
-                                ignition_state = io_elements[239]
-                                activity_id = 2 if ignition_state == 1 else 3  # Engine ON/OFF
-                                activity_source = "I/O 239 (Ignition)"
-                                print(f"DEBUG: Fallback - Using I/O 239 as activity: {activity_id}, state: {ignition_state}")
-                            
-                            # Final fallback: Use default movement activity for any GPS record
-                            else:
-                                activity_id = 1  # Default LATRA Movement/Logging activity
-                                activity_source = "Default fallback"
-                                print(f"DEBUG: Final fallback - Using default activity: {activity_id}")
-                        else:
-                            activity_source = "Pre-calculated LATRA mapping"
-                        
-                        # Ensure we always have an activity ID (should never be None now)
-                        if activity_id is None:
-                            activity_id = 1  # Ultimate fallback to Movement/Logging
-                            print(f"DEBUG: Ultimate fallback - Using activity ID: {activity_id}")
-                        
-                        print(f"DEBUG: Final LATRA Activity ID for transmission: {activity_id} (source: {activity_source})")
-                        
-                        # Generate dynamic MGS_ID for this record
-                        dynamic_mgs_id = self.generate_dynamic_mgs_id()
-                        
-                        # Get speed value
-                        speed_value = record.get("speed", 0)
-                        
-                        print(f"🎯 LATRA TRANSMISSION DETAILS:")
-                        print(f"   📍 Activity ID: {activity_id} (Source: {activity_source})")
-                        print(f"   🚗 Speed: {speed_value} km/h")
-                        print(f"   📱 IMEI: {vehicle.imei.imei_number}")
-                        print(f"   🚙 Vehicle: {getattr(vehicle, 'name', 'Unknown')}")
-                        print(f"   🌐 GPS: Will be determined after coordinate validation")
-                        print(f"   ⏰ Timestamp: {timestamp}")
+        """Send data to LATRA API (retried by the session adapter) with activity-specific addon_info"""
+        body, item_count, error = self.build_latra_payload(vehicle, data)
+        if body is None:
+            return False, error
+        return self.post_latra_payload(vehicle.imei.imei_number, body, item_count)
+
+    def send_to_latra_async(self, vehicle, data):
+        """Run send_to_latra on the upload pool; the Future resolves to (success, response)"""
+        return self.latra_executor.submit(self.send_to_latra, vehicle, data)
+
+    def build_latra_payload(self, vehicle, data):
+        """Serialise parsed records for LATRA; returns (body, item_count, None) or (None, 0, error)"""
+        try:
+            imei_number = vehicle.imei.imei_number
+            vehicle_reg_no = getattr(vehicle, 'registration_number', None) or imei_number[-6:]
+            vehicle_name = getattr(vehicle, 'name', 'Unknown')
+
+            # Prepare payload for each record (built once; only the POST is retried)
+            records = data['records']
+            items = [None] * len(records)  # one slot per record; failed records stay None
+            # Batch-wide bounds for timestamp validation (not in future by more than 1 day)
+            current_time = int(time.time() * 1000)
+            latest_valid_timestamp = current_time + (24 * 60 * 60 * 1000)
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
+            # Per-record builders, resolved once for the whole batch
+            generate_mgs_id = self.generate_dynamic_mgs_id
+            get_extras = self.extract_activity_extras
+            for index, record in enumerate(records):
+                try:
+                    # Device epoch ms stamped by the parser; no string round-trip
+                    timestamp = record.get("timestamp_ms")
+                    if timestamp is None:
+                        logger.warning("Record has no device timestamp, using current time")
+                        timestamp = current_time
+                    elif timestamp <= 0 or timestamp > latest_valid_timestamp:
+                        # Validate timestamp (should be reasonable)
+                        logger.warning("Invalid timestamp %s, using current time", timestamp)
+                        timestamp = current_time
+                    
+                    # Fetch every record field used below once
+                    io_elements = record.get("io_elements", {})
+                    event_id = record.get("event_id", 0)
+                    speed_value = record.get("speed", 0)
+                    latitude = record.get("latitude", 0)
+                    longitude = record.get("longitude", 0)
+                    altitude = record.get("altitude", 0)
+                    angle = record.get("angle", 0)
+                    satellite_count = record.get("satellites", 0)
+                    
+                    # Use the pre-calculated LATRA activity ID from parsing
+                    activity_id = record.get("latra_activity_id")
+                    activity_source = "none"
+                    
+                    # Fallback logic if latra_activity_id is not set
+                    if activity_id is None:
+                        # Primary: Use Event ID field and map to LATRA activity
                         if event_id and event_id != 0:
-                            event_name = ACTIVITY_CODES.get(event_id, f"Event {event_id}")
-                            print(f"   🔢 Event ID: {event_id} (0x{event_id:02X}) - {event_name}")
-                        if io_elements:
-                            print(f"   🔌 I/O Elements: {len(io_elements)} elements")
-                            for io_id, io_value in list(io_elements.items())[:5]:  # Show first 5
-                                print(f"      - I/O {io_id}: {io_value}")
-                            if len(io_elements) > 5:
-                                print(f"      ... and {len(io_elements) - 5} more I/O elements")
-                        print(f"   🚀 STATUS: PREPARING FOR LATRA TRANSMISSION ✅")
-                        
-                        # Build base item with proper validation
-                        latitude = record.get("latitude", 0)
-                        longitude = record.get("longitude", 0)
+                            activity_id = EVENT_TO_LATRA_ID.get(event_id, event_id)  # Use Event ID directly if no mapping
+                            activity_source = "Event ID"
+                            logger.debug("Fallback - Using Event ID as activity: %s", activity_id)
                         
-                        print(f"🔍 COORDINATE DEBUG:")
-                        print(f"   Raw latitude: {latitude} (type: {type(latitude)})")
-                        print(f"   Raw longitude: {longitude} (type: {type(longitude)})")
-                        print(f"   Activity ID: {activity_id}")
-                        print(f"   Record data: {record.get('latitude')}, {record.get('longitude')}")
+                        # Secondary: Use I/O 240 (Movement) -> LATRA Activity 1
+                        elif 240 in io_elements:
+                            activity_id = 1  # LATRA Movement/Logging activity
+                            activity_source = "I/O 240 (Movement)"
+                            movement_state = io_elements[240]
+                            logger.debug("Fallback - Using I/O 240 as activity: %s, state: %s", activity_id, movement_state)
                         
-                        # Define activities that don't require valid GPS coordinates
-                        non_gps_activities = [8, 9, 10, 14, 15, 16, 17, 24, 26, 31, 34]  # Panic, Battery, Power, Device events, etc.
+                        # Tertiary: Use I/O 239 (Ignition) -> LATRA Activity 2/3
+                        elif 239 in io_elements:
+                            ignition_state = io_elements[239]
+                            activity_id = 2 if ignition_state == 1 else 3  # Engine ON/OFF
+                            activity_source = "I/O 239 (Ignition)"
+                            logger.debug("Fallback - Using I/O 239 as activity: %s, state: %s", activity_id, ignition_state)
                         
-                        # More inclusive coordinate validation
-                        coordinates_valid = False
-                        
-                        # Check if coordinates are in valid range
-                        if (-90.0 <= latitude <= 90.0) and (-180.0 <= longitude <= 180.0):
-                            if latitude != 0.0 or longitude != 0.0:
-                                coordinates_valid = True
-                                print(f"✅ VALID GPS COORDINATES: ({latitude:.6f}, {longitude:.6f})")
-                            else:
-                                # (0,0) coordinates - acceptable for some activities
-                                if activity_id in non_gps_activities:
-                                    # Use Nairobi as fallback for non-GPS activities
-                                    latitude = -1.286389
-                                    longitude = 36.817223
-                                    coordinates_valid = True
-                                    print(f"🌍 NON-GPS ACTIVITY: Using Nairobi coordinates ({latitude:.6f}, {longitude:.6f})")
-                                else:
-                                    # For GPS-dependent activities, use fallback coordinates but mark as valid
-                                    latitude = -1.286389
-                                    longitude = 36.817223
-                                    coordinates_valid = True
-                                    print(f"⚠️ GPS ACTIVITY WITH (0,0): Using Nairobi fallback ({latitude:.6f}, {longitude:.6f})")
+                        # Final fallback: Use default movement activity for any GPS record
                         else:
-                            # Invalid coordinates - still allow for non-GPS activities
-                            if activity_id in non_gps_activities:
-                                latitude = -1.286389
-                                longitude = 36.817223
-                                coordinates_valid = True
-                                print(f"🔧 INVALID GPS FOR NON-GPS ACTIVITY: Using Nairobi coordinates ({latitude:.6f}, {longitude:.6f})")
-                            else:
-                                print(f"❌ INVALID COORDINATES FOR GPS ACTIVITY: ({latitude},{longitude}) - WILL STILL SEND WITH FALLBACK")
-                                latitude = -1.286389
-                                longitude = 36.817223
-                                coordinates_valid = True
-                        
-                        # ALWAYS try to send to LATRA - let LATRA decide if coordinates are acceptable
-                        if not coordinates_valid:
-                            latitude = -1.286389
-                            longitude = 36.817223
-                            print(f"� FINAL FALLBACK: Using Nairobi coordinates ({latitude:.6f}, {longitude:.6f})")
-                        
-                        print(f"📍 FINAL COORDINATES TO SEND: ({latitude:.6f}, {longitude:.6f})")
-                        
-                        
-                        # Extract additional LATRA required fields from I/O elements - ONLY REAL DATA
-                        io_elements = record.get("io_elements", {})
-                        
-                        # Satellite Count - Only from parsed GPS data
-                        satellite_count = record.get("satellites", 0)
-                        # NO DEFAULT from I/O elements
-                        
-                        # HDOP (Horizontal Dilution of Precision) - Only from actual I/O
-                        hdop_value = "0"  # Default to 0 (unknown) instead of fake value
-                        if 182 in io_elements:  # GPS HDOP
-                            hdop_value = f"{io_elements[182] / 10:.1f}"
-                        # NO ESTIMATION from other I/O elements
-                        
-                        # GPS Mode (2D/3D) - Only from actual I/O
-                        gps_mode = "0"  # Default to 0 (unknown) instead of fake 3D
-                        if 181 in io_elements:  # GPS Fix Type
-                            fix_type = io_elements[181]
-                            gps_mode = "2" if fix_type == 2 else "3"
-                        elif satellite_count >= 4:
-                            gps_mode = "3"  # Only if we have enough satellites
-                        elif satellite_count > 0:
-                            gps_mode = "2"  # 2D if some satellites
-                        
-                        # RSSI (Received Signal Strength Indication) - Only from actual I/O
-                        rssi_value = "0"  # Default to 0 (unknown)
-                        if 21 in io_elements:  # GSM Signal Strength
-                            rssi_value = str(io_elements[21])
-                        # NO ESTIMATION from other sources
-                        
-                        # LAC (Location Area Code) - Only from actual I/O
-                        lac_value = "0"  # Default to 0 (unknown) instead of fake 123
-                        if 212 in io_elements:  # GSM Cell LAC
-                            lac_value = str(io_elements[212])
-                        # NO EXTRACTION from operator codes
-                        
-                        # Cell ID - Only from actual I/O
-                        cell_id_value = "0"  # Default to 0 (unknown) instead of fake 12345
-                        if 213 in io_elements:  # GSM Cell ID
-                            cell_id_value = str(io_elements[213])
-                        # NO FALLBACK to other I/O elements
-                        
-                        # MCC (Mobile Country Code) - Only from actual I/O
-                        mcc_value = "0"  # Default to 0 (unknown) instead of assuming Kenya
-                        if 14 in io_elements:  # GSM Operator Code
-                            operator_code = io_elements[14]
-                            try:
-                                # Ensure operator_code is an integer for comparison
-                                operator_code_int = int(operator_code) if isinstance(operator_code, str) else operator_code
-                                if operator_code_int > 100000:
-                                    mcc_value = str(operator_code_int)[:3]
-                            except (ValueError, TypeError):
-                                print(f"DEBUG: Invalid operator code: {operator_code}, using default MCC")
-                                mcc_value = "0"
-                        
-                        print(f"📊 LATRA FIELDS - REAL DATA ONLY:")
-                        print(f"   ️  Satellite Count: {satellite_count} (Source: {'GPS data' if satellite_count > 0 else 'NOT AVAILABLE'})")
-                        print(f"   📡 HDOP: {hdop_value} (Source: {'I/O 182' if 182 in io_elements else 'NOT AVAILABLE'})")
-                        print(f"   🌐 GPS Mode: {gps_mode} (Source: {'I/O 181' if 181 in io_elements else 'satellite count' if satellite_count > 0 else 'NOT AVAILABLE'})")
-                        print(f"   📶 RSSI: {rssi_value} (Source: {'I/O 21' if 21 in io_elements else 'NOT AVAILABLE'})")
-                        print(f"   🏢 LAC: {lac_value} (Source: {'I/O 212' if 212 in io_elements else 'NOT AVAILABLE'})")
-                        print(f"   📱 Cell ID: {cell_id_value} (Source: {'I/O 213' if 213 in io_elements else 'NOT AVAILABLE'})")
-                        print(f"   🌍 MCC: {mcc_value} (Source: {'I/O 14' if 14 in io_elements else 'NOT AVAILABLE'})")
-
-                        item = {
-                            "latitude": str(f"{latitude:.6f}"),
-                            "longitude": str(f"{longitude:.6f}"),
-                            "altitude": str(int(record.get("altitude", 0))),
-                            "timestamp": str(timestamp),
-                            "horizontal_speed": str(int(speed_value)),
-                            "vertical_speed": str(0),
-                            "bearing": str(int(record.get("angle", 0))),
-                            "satellite_count": str(int(satellite_count)),
-                            "HDOP": str(hdop_value),
-                            "d2d3": str(gps_mode),
-                            "RSSI": str(rssi_value),
-                            "LAC": str(lac_value),
-                            "Cell_ID": str(cell_id_value),
-                            "MGS_ID": str(dynamic_mgs_id),
-                            "MCC": str(mcc_value),
-                            "activity_id": str(activity_id)  # Send activity_id as string without modification
-                        }
-                        
-                        # Add addon_info based on activity ID
-                        addon_info = self.get_addon_info_for_activity(activity_id, io_elements)
-                        if addon_info:
-                            item["addon_info"] = addon_info
-                            print(f"📋 ADDON_INFO ADDED: {addon_info}")
-                        
-                        # Add fuel_info for activity 16
-                        fuel_info = self.get_fuel_info_for_activity(activity_id, io_elements)
-                        if fuel_info:
-                            item["fuel_info"] = fuel_info
-                            print(f"⛽ FUEL_INFO ADDED: {fuel_info}")
-                        
-                        # Print complete item data before adding to items list
-                        print(f"\n🎯 COMPLETE LATRA ITEM DATA:")
-                        print(f"{'='*60}")
-                        for key, value in item.items():
-                            print(f"   {key}: {value}")
-                        print(f"{'='*60}")
-                        
-                        items.append(item)
-                        
-                    except Exception as e:
-                        print(f"Error preparing record for LATRA: {e}")
-                        continue
-
-                # Only send if we have valid items with GPS data
-                if not items:
-                    print("❌ NO VALID GPS RECORDS TO SEND TO LATRA")
-                    print("📍 All records were filtered out during validation")
-                    print("🔍 Common reasons:")
-                    print("   - Coordinates were exactly (0.0, 0.0) indicating no GPS fix")
-                    print("   - Coordinates were outside valid ranges (-90 to 90 lat, -180 to 180 lon)")
-                    print("   - Parsing errors occurred during record processing")
-                    print("🚫 Check GPS device connection and satellite reception")
-                    return False, {"error": "No valid GPS data to send - all records filtered out"}
-
-                payload = {
-                    "vehicle_reg_no": getattr(vehicle, 'registration_number', vehicle.imei.imei_number[-6:]),
-                    "type": "poi",
-                    "imei": vehicle.imei.imei_number,
-                    "items": items
-                }
-
-                headers = {
-                    "Authorization": f"Basic {settings.LATRA_API_TOKEN}",
-                    "Content-Type": "application/json"
-                }
-
-                # Comprehensive payload logging
-                print(f"\n🚀 FINAL LATRA PAYLOAD - SENDING TO API:")
-                print(f"{'='*80}")
-                print(f"📡 API URL: {settings.LATRA_API_URL}")
-                print(f"🚙 Vehicle Registration: {payload['vehicle_reg_no']}")
-                print(f"📱 IMEI: {payload['imei']}")
-                print(f"📊 Type: {payload['type']}")
-                print(f"📦 Total Items: {len(payload['items'])}")
-                print(f"{'='*80}")
-                
-                # Print each item in detail
-                for idx, item in enumerate(payload['items'], 1):
-                    print(f"\n📍 ITEM {idx} DATA:")
-                    print(f"   🌍 Location: ({item['latitude']}, {item['longitude']})")
-                    print(f"   🏔️  Altitude: {item['altitude']} m")
-                    print(f"   ⏰ Timestamp: {item['timestamp']}")
-                    print(f"   🚗 Speed (H/V): {item['horizontal_speed']}/{item['vertical_speed']} km/h")
-                    print(f"   🧭 Bearing: {item['bearing']}°")
-                    print(f"   🛰️  Satellites: {item['satellite_count']}")
-                    print(f"   📡 HDOP: {item['HDOP']}")
-                    print(f"   🌐 GPS Mode: {item['d2d3']}D")
-                    print(f"   📶 RSSI: {item['RSSI']}")
-                    print(f"   🏢 LAC: {item['LAC']}")
-                    print(f"   📱 Cell ID: {item['Cell_ID']}")
-                    print(f"   🆔 MGS ID: {item['MGS_ID']}")
-                    print(f"   🌍 MCC: {item['MCC']}")
-                    print(f"   🎯 Activity ID: {item['activity_id']}")
+                            activity_id = 1  # Default LATRA Movement/Logging activity
+                            activity_source = "Default fallback"
+                            logger.debug("Final fallback - Using default activity: %s", activity_id)
+                    else:
+                        activity_source = "Pre-calculated LATRA mapping"
                     
-                    if 'addon_info' in item:
-                        print(f"   📋 Addon Info:")
-                        for key, value in item['addon_info'].items():
-                            print(f"      - {key}: {value}")
+                    # Ensure we always have an activity ID (should never be None now)
+                    if activity_id is None:
+                        activity_id = 1  # Ultimate fallback to Movement/Logging
+                        logger.debug("Ultimate fallback - Using activity ID: %s", activity_id)
                     
-                    if 'fuel_info' in item:
-                        print(f"   ⛽ Fuel Info:")
-                        for key, value in item['fuel_info'].items():
-                            print(f"      - {key}: {value}")
-                
-                print(f"\n{'='*80}")
-                print(f"🚀 SENDING COMPLETE PAYLOAD TO LATRA...")
-                print(f"{'='*80}")
-
-                # Also print the raw JSON payload
-                print(f"\n📄 RAW JSON PAYLOAD:")
-                print(json.dumps(payload, indent=2, ensure_ascii=False))
-
-                response = requests.post(
-                    settings.LATRA_API_URL,
-                    json=payload,
-                    headers=headers,
-                    timeout=10
+                    # Generate dynamic MGS_ID for this record
+                    dynamic_mgs_id = generate_mgs_id()
+                    
+                    # More inclusive coordinate validation: anything without a usable fix is
+                    # still sent with the fallback position - let LATRA decide if it is acceptable
+                    if (-90.0 <= latitude <= 90.0) and (-180.0 <= longitude <= 180.0) and (latitude != 0.0 or longitude != 0.0):
+                        latitude_str = f"{latitude:.6f}"
+                        longitude_str = f"{longitude:.6f}"
+                    else:
+                        if debug_enabled:
+                            logger.debug(
+                                "No usable GPS fix (%s, %s) for %s activity %s: using Nairobi fallback",
+                                latitude, longitude, "non-GPS" if activity_id in NON_GPS_ACTIVITIES else "GPS", activity_id,
+                            )
+                        latitude_str = FALLBACK_LATITUDE
+                        longitude_str = FALLBACK_LONGITUDE
+                    
+                    # Extract additional LATRA required fields from I/O elements - ONLY REAL DATA
+                    hdop_value, gps_mode, rssi_value, lac_value, cell_id_value, mcc_value = _gsm_fields(io_elements, satellite_count)
+                    
+                    item = {
+                        "latitude": latitude_str,
+                        "longitude": longitude_str,
+                        "altitude": _int_str(altitude),
+                        "timestamp": str(timestamp),
+                        "horizontal_speed": _int_str(speed_value),
+                        "vertical_speed": "0",
+                        "bearing": _int_str(angle),
+                        "satellite_count": _int_str(satellite_count),
+                        "HDOP": hdop_value,
+                        "d2d3": gps_mode,
+                        "RSSI": rssi_value,
+                        "LAC": lac_value,
+                        "Cell_ID": cell_id_value,
+                        "MGS_ID": dynamic_mgs_id,
+                        "MCC": mcc_value,
+                        "activity_id": str(activity_id)  # Send activity_id as string without modification
+                    }
+                    
+                    # Add addon_info / fuel_info (activity 16) based on activity ID
+                    addon_info, fuel_info = get_extras(activity_id, io_elements)
+                    if addon_info:
+                        item["addon_info"] = addon_info
+                    if fuel_info:
+                        item["fuel_info"] = fuel_info
+                    
+                    if debug_enabled:
+                        # One log call per item; the item itself carries the derived LATRA fields
+                        logger.debug("\n".join((
+                            f"LATRA TRANSMISSION DETAILS: activity={activity_id} (source: {activity_source}) "
+                            f"speed={speed_value} km/h imei={imei_number} vehicle={vehicle_name} timestamp={timestamp} "
+                            f"event_id={event_id} ({ACTIVITY_CODES.get(event_id, f'Event {event_id}') if event_id else 'none'}) "
+                            f"io_elements={len(io_elements)} raw_coordinates=({latitude!r}, {longitude!r})",
+                            f"Complete LATRA item: {item}",
+                        )))
+                    items[index] = item
+                    
+                except Exception as e:
+                    logger.error("Error preparing record for LATRA: %s", e)
+                    continue
+
+            # Drop the slots of records that could not be prepared
+            if None in items:
+                items = [item for item in items if item is not None]
+
+            # Only send if we have valid items with GPS data
+            if not items:
+                logger.warning(
+                    "No valid GPS records to send to LATRA for IMEI %s: all %d records were filtered out",
+                    imei_number, len(records),
+                )
+                return None, 0, {"error": "No valid GPS data to send - all records filtered out"}
+
+            payload = {
+                "vehicle_reg_no": vehicle_reg_no,
+                "type": "poi",
+                "imei": imei_number,
+                "items": items
+            }
+
+            logger.info("Sending %d items to LATRA for %s (IMEI %s)", len(items), vehicle_reg_no, imei_number)
+
+            # Serialise once with orjson; the same bytes are reused by every retry
+            body = orjson.dumps(payload)
+
+            # Identify the payload by size and digest instead of re-encoding it for the log
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "LATRA payload size=%d items=%d blake2b=%s",
+                    len(body), len(items), hashlib.blake2b(body, digest_size=8).hexdigest(),
                 )
+            return body, len(items), None
+        except Exception as e:
+            return None, 0, {"error": str(e)}
+
+    def post_latra_payload(self, imei_number, body, item_count):
+        """POST a serialised payload to LATRA; returns (success, response)"""
+        try:
+            started = time.perf_counter()
+            # Stream the response so only a bounded prefix of the body is ever read
+            with _get_latra_session().post(
+                LATRA_URL,
+                data=body,
+                timeout=10,
+                stream=True
+            ) as response:
                 
                 # Better error handling
                 if response.status_code != 200:
+                    error_body = response.raw.read(LATRA_ERROR_BODY_LIMIT, decode_content=True)
                     error_msg = f"LATRA API returned status {response.status_code}"
                     try:
-                        error_data = response.json()
-                        error_msg += f": {error_data}"
-                        print(f"LATRA Error Response: {error_data}")
-                    except:
-                        error_msg += f": {response.text}"
-                        print(f"LATRA Error Text: {response.text}")
+                        error_msg += f": {orjson.loads(error_body)}"
+                    except ValueError:
+                        error_msg += f": {error_body.decode('utf-8', 'replace')}"
+                    logger.warning("LATRA upload failed for IMEI %s: %s", imei_number, error_msg)
                     return False, {"error": error_msg}
                 
-                response_data = response.json()
-                print(f"\n✅ LATRA API SUCCESS RESPONSE:")
-                print(f"{'='*50}")
-                print(f"📊 Status Code: {response.status_code}")
-                print(f"📨 Response Data: {json.dumps(response_data, indent=2, ensure_ascii=False)}")
-                print(f"⏱️  Response Time: {response.elapsed.total_seconds():.2f} seconds")
-                print(f"📦 Items Sent: {len(items)}")
-                print(f"{'='*50}")
-                return True, response_data
-                
-            except requests.exceptions.RequestException as e:
-                if attempt == max_retries - 1:
-                    return False, {"error": str(e)}
-                time.sleep(retry_delay * (attempt + 1))
-            except Exception as e:
-                return False, {"error": str(e)}
-        
-        return False, {"error": "Max retries exceeded"}
+                body = response.raw.read(LATRA_RESPONSE_BODY_LIMIT, decode_content=True)
+                try:
+                    response_data = orjson.loads(body)
+                except ValueError:
+                    # A 200 means LATRA accepted the upload, even if the body is cut off at the limit or not JSON
+                    response_data = {"raw": body.decode('utf-8', 'replace'), "truncated": len(body) >= LATRA_RESPONSE_BODY_LIMIT}
+            logger.info(
+                "LATRA accepted %d items for IMEI %s in %.2fs",
+                item_count, imei_number, time.perf_counter() - started,
+            )
+            logger.debug("LATRA response: %s", response_data)
+            return True, response_data
+            
+        except requests.exceptions.RequestException as e:
+            logger.warning("LATRA request failed for IMEI %s after retries: %s", imei_number, e)
+            return False, {"error": str(e)}
+        except Exception as e:
+            return False, {"error": str(e)}
 
 if __name__ == "__main__":
     listener = GPSListener()
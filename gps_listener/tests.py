@@ -1,3 +1,369 @@
-from django.test import TestCase
+import io
+import signal
+import time
+import threading
+import types
+from concurrent.futures import Future
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from gps_listener import services
+from gps_listener.services import GPSListener
+
+DEVICE_IMEI = "356307042441013"
+
+# Codec 8 packet captured from an FMB120 (one record, 1/2/4/8-byte I/O elements)
+CODEC_8_PACKET = (
+    "0000000000000076080100000198af1f6ca80016d2955efc8c266001ac00ad100031001a0bef01f0011505c800450101"
+    "01b30002000300b40071640ab5000bb6000742313d180031cd4e22ce00d8430ff544000009010406010403f10000fa04"
+    "c700060d7c10016d1477020b00000002140063f40e00000000271581f70100001a6b"
+)
+
+# Codec 8E packet with one variable-length I/O element (256, VIN)
+CODEC_8E_PACKET = (
+    "00000000000000008e0100000198af1f6ca80016d2955efc8c2660000a000507000000000004000200ef0100f0010001"
+    "004230d4000100f10001e240000000010100000756494e31323334"
+)
+
+# Records as produced by the original hex-string codec_8e_parser for the packets above
+# (timestamp strings and the server-time dependent fields are checked separately)
+CODEC_8_RECORD = {
+    'record_number': 1,
+    'imei': DEVICE_IMEI,
+    'parse_errors': [],
+    'timestamp_ms': 1755284729000,
+    'priority': 0,
+    'longitude': 38.289955,
+    'latitude': -5.7924,
+    'altitude': 428,
+    'angle': 173,
+    'satellites': 16,
+    'speed': 49,
+    'event_id': 0,
+    'io_elements': {
+        239: 1, 240: 1, 21: 5, 200: 0, 69: 1, 1: 1, 179: 0, 2: 0, 3: 0, 180: 0, 113: '0x64',
+        181: 1.1, 182: 0.7, 66: 126.05, 24: 49, 205: 20002, 206: 216, 67: 40.85, 68: 0.0, 9: 260,
+        6: 0.26, 241: 6400.4, 199: '0x00060d7c', 16: 23925879, 11: 8925504500, 14: '0x00000000271581f7',
+    },
+    'activity': '1 - Movement/Logging (I/O 240 Movement ON)',
+    'latra_activity_id': 1,
+}
+CODEC_8E_RECORD = {
+    'record_number': 1,
+    'imei': DEVICE_IMEI,
+    'parse_errors': [],
+    'timestamp_ms': 1755284729000,
+    'priority': 0,
+    'longitude': 38.289955,
+    'latitude': -5.7924,
+    'altitude': 10,
+    'angle': 5,
+    'satellites': 7,
+    'speed': 0,
+    'event_id': 0,
+    'io_elements': {239: 1, 240: 1, 66: 125.0, 241: 12345.6, 256: 24287448178766644},
+    'activity': '1 - Movement/Logging (I/O 240 Movement ON)',
+    'latra_activity_id': 1,
+}
+
+
+class CodecParserTests(SimpleTestCase):
+    """codec_8e_parser_bin must decode packets exactly as the original hex parser did"""
+
+    def setUp(self):
+        self.listener = GPSListener()
+
+    def parse(self, hex_packet):
+        parsed = self.listener.codec_8e_parser_bin(bytes.fromhex(hex_packet), DEVICE_IMEI)
+        self.assertEqual(parsed['device_imei'], DEVICE_IMEI)
+        self.assertEqual(parsed['parse_errors'], [])
+        self.assertIn('server_time', parsed)
+        for record in parsed['records']:
+            self.assertTrue(record.pop('timestamp').endswith("19:05:29 15-08-2025 (utc)"))
+            self.assertTrue(record.pop('timestamp_delay').endswith(" seconds"))
+        return parsed['records']
+
+    def test_codec_8_packet(self):
+        self.assertEqual(self.parse(CODEC_8_PACKET), [CODEC_8_RECORD])
+
+    def test_codec_8e_packet(self):
+        self.assertEqual(self.parse(CODEC_8E_PACKET), [CODEC_8E_RECORD])
+
+    def test_wide_signed_axis_value_is_kept_as_hex(self):
+        # 8-byte I/O 17 does not fit the signed 32-bit decode; the original parser kept it as hex
+        packet = (
+            "000000000000002a080100000198af1f6ca80016d2955efc8c266001ac00ad1000310001"
+            "0000000111fffffffffffffff6010000f013"
+        )
+        self.assertEqual(self.parse(packet)[0]['io_elements'], {17: '0xfffffffffffffff6'})
+        self.assertEqual(self.listener.sorting_hat(17, "fffffffffffffff6"), '0xfffffffffffffff6')
+        self.assertEqual(self.listener.sorting_hat(17, "fffffff6"), -10)
+
+    def test_truncated_packet_reports_error(self):
+        parsed = self.listener.codec_8e_parser_bin(bytes.fromhex(CODEC_8_PACKET)[:40], DEVICE_IMEI)
+        self.assertEqual(parsed['records'], [])
+        self.assertEqual(len(parsed['parse_errors']), 1)
+
+
+class PacketDetectionTests(SimpleTestCase):
+    def setUp(self):
+        self.listener = GPSListener()
+
+    def test_imei_packet(self):
+        packet = b"\x00\x0f" + DEVICE_IMEI.encode('ascii')
+        self.assertTrue(self.listener.imei_checker(packet))
+        self.assertEqual(self.listener.ascii_imei_converter(packet), DEVICE_IMEI)
+        self.assertFalse(self.listener.imei_checker(packet[:-1]))
+
+    def test_codec_packet(self):
+        self.assertTrue(self.listener.codec_8e_checker(bytes.fromhex(CODEC_8_PACKET)))
+        self.assertTrue(self.listener.codec_8e_checker(bytes.fromhex(CODEC_8E_PACKET)))
+        self.assertFalse(self.listener.codec_8e_checker(bytes(9)))
+
+
+def make_vehicle(imei_number):
+    return types.SimpleNamespace(
+        imei=types.SimpleNamespace(imei_number=imei_number), name=imei_number[-6:], registration_number=imei_number[-6:]
+    )
+
+
+class LatraBatcherTests(SimpleTestCase):
+    """queue_for_latra / latra_batch_worker with send_to_latra patched out"""
+
+    def setUp(self):
+        self.listener = GPSListener()
+        patcher = mock.patch.object(self.listener, 'send_to_latra', return_value=(True, {"ok": True}))
+        self.send_to_latra = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def enqueue(self, vehicle, data):
+        """Queue a packet without starting the batcher, so it is drained with the next queue_for_latra"""
+        future = Future()
+        self.listener.latra_queue.put((vehicle, data, future))
+        return future
+
+    def test_single_packet_is_sent_as_is(self):
+        vehicle, data = make_vehicle(DEVICE_IMEI), {"records": [{"record_number": 1}]}
+        result = self.listener.queue_for_latra(vehicle, data).result(timeout=5)
+        self.assertEqual(result, (True, {"ok": True}))
+        self.send_to_latra.assert_called_once_with(vehicle, data)
+
+    def test_packets_for_one_imei_share_one_upload(self):
+        vehicle = make_vehicle(DEVICE_IMEI)
+        first = self.enqueue(vehicle, {"records": [{"record_number": 1}]})
+        second = self.listener.queue_for_latra(vehicle, {"records": [{"record_number": 2}, {"record_number": 3}]})
+
+        shared = (True, {"merged_upload": {"packets": 2, "records": 3}, "response": {"ok": True}})
+        self.assertEqual(first.result(timeout=5), shared)
+        self.assertEqual(second.result(timeout=5), shared)
+        self.send_to_latra.assert_called_once_with(
+            vehicle, {"records": [{"record_number": 1}, {"record_number": 2}, {"record_number": 3}]}
+        )
+
+    def test_packets_are_grouped_by_imei(self):
+        first = self.enqueue(make_vehicle(DEVICE_IMEI), {"records": [{"record_number": 1}]})
+        other = self.listener.queue_for_latra(make_vehicle("111111111111111"), {"records": [{"record_number": 1}]})
+        self.assertEqual(first.result(timeout=5), (True, {"ok": True}))
+        self.assertEqual(other.result(timeout=5), (True, {"ok": True}))
+        self.assertEqual(self.send_to_latra.call_count, 2)
+
+    def test_vehicle_without_imei_fails_only_its_own_packet(self):
+        broken = self.enqueue(object(), {"records": []})
+        good = self.listener.queue_for_latra(make_vehicle(DEVICE_IMEI), {"records": [{"record_number": 1}]})
+        success, response = broken.result(timeout=5)
+        self.assertFalse(success)
+        self.assertIn("imei", response["error"])
+        self.assertEqual(good.result(timeout=5), (True, {"ok": True}))
+
+    def test_upload_exception_resolves_every_future(self):
+        self.send_to_latra.side_effect = RuntimeError("boom")
+        result = self.listener.queue_for_latra(make_vehicle(DEVICE_IMEI), {"records": []}).result(timeout=5)
+        self.assertEqual(result, (False, {"error": "boom"}))
+
+    def test_fail_latra_entries_leaves_resolved_futures_alone(self):
+        done, waiting = Future(), Future()
+        done.set_result((True, {"ok": True}))
+        self.listener.fail_latra_entries([(None, None, done), (None, None, waiting)], RuntimeError("down"))
+        self.assertEqual(done.result(), (True, {"ok": True}))
+        self.assertEqual(waiting.result(), (False, {"error": "down"}))
+
+    def test_dead_batcher_is_restarted(self):
+        dead = threading.Thread(target=lambda: None)
+        dead.start()
+        dead.join()
+        self.listener.latra_batcher = dead
+
+        result = self.listener.queue_for_latra(make_vehicle(DEVICE_IMEI), {"records": []}).result(timeout=5)
+        self.assertEqual(result, (True, {"ok": True}))
+        self.assertIsNot(self.listener.latra_batcher, dead)
+        self.assertTrue(self.listener.latra_batcher.is_alive())
+
+
+class ReportedDataBufferTests(SimpleTestCase):
+    """save_reported_data / flush_reported_data with the ReportedData model patched out"""
+
+    def setUp(self):
+        self.listener = GPSListener()
+        self.listener.reported_data_flusher = object()  # no background flusher thread in tests
+        patcher = mock.patch.object(services, 'ReportedData')
+        self.model = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.model.side_effect = lambda **fields: mock.Mock(vehicle_id=fields['vehicle'], **fields)
+        connection_patcher = mock.patch.object(services, 'connection')
+        connection_patcher.start()
+        self.addCleanup(connection_patcher.stop)
+
+    def save_rows(self, count):
+        for number in range(count):
+            self.listener.save_reported_data(number, "00", {}, {"ok": True}, True)
+
+    def test_rows_are_written_in_bulk_at_flush_size(self):
+        self.save_rows(services.REPORTED_DATA_FLUSH_SIZE - 1)
+        self.model.objects.bulk_create.assert_not_called()
+
+        self.save_rows(1)
+        self.model.objects.bulk_create.assert_called_once()
+        rows = self.model.objects.bulk_create.call_args[0][0]
+        self.assertEqual(len(rows), services.REPORTED_DATA_FLUSH_SIZE)
+        self.assertEqual(self.listener.pending_rows, [])
+
+    def test_failed_bulk_create_falls_back_to_row_saves(self):
+        self.model.objects.bulk_create.side_effect = RuntimeError("batch failed")
+        self.save_rows(3)
+        self.listener.pending_rows[1].save.side_effect = RuntimeError("bad row")
+        rows = list(self.listener.pending_rows)
+
+        with self.assertLogs('gps_listener.services', 'ERROR') as logs:
+            self.listener.flush_reported_data()
+
+        for row in rows:
+            row.save.assert_called_once_with()
+        self.assertIn("Dropped 1 of 3 ReportedData rows", logs.output[-1])
+        self.assertEqual(self.listener.pending_rows, [])
+
+    def test_stop_signal_flushes_the_buffer(self):
+        self.save_rows(3)
+        with mock.patch.object(services.signal, 'signal') as set_handler, \
+                mock.patch.object(services.os, 'kill') as kill:
+            self.listener.handle_stop_signal(signal.SIGTERM, None)
+
+        self.assertEqual(len(self.model.objects.bulk_create.call_args[0][0]), 3)
+        self.assertEqual(self.listener.pending_rows, [])
+        set_handler.assert_called_once_with(signal.SIGTERM, signal.SIG_DFL)
+        kill.assert_called_once_with(services.os.getpid(), signal.SIGTERM)
+
+
+class VehicleCacheTests(SimpleTestCase):
+    """get_cached_vehicle with the Vehicle model and the clock patched out"""
+
+    def setUp(self):
+        self.listener = GPSListener()
+        model_patcher = mock.patch.object(services, 'Vehicle')
+        self.lookup = model_patcher.start().objects.select_related.return_value.filter
+        self.addCleanup(model_patcher.stop)
+        time_patcher = mock.patch.object(services, 'time')
+        self.clock = time_patcher.start().monotonic
+        self.addCleanup(time_patcher.stop)
+        self.clock.return_value = 1000.0
+
+    def test_unknown_imei_is_remembered_for_a_minute(self):
+        self.lookup.return_value.first.return_value = None
+        self.assertIsNone(self.listener.get_cached_vehicle(DEVICE_IMEI))
+
+        self.clock.return_value = 1000.0 + services.UNKNOWN_VEHICLE_CACHE_TIMEOUT - 1
+        self.assertIsNone(self.listener.get_cached_vehicle(DEVICE_IMEI))
+        self.assertEqual(self.lookup.call_count, 1)
+
+        self.clock.return_value = 1000.0 + services.UNKNOWN_VEHICLE_CACHE_TIMEOUT + 1
+        self.listener.get_cached_vehicle(DEVICE_IMEI)
+        self.assertEqual(self.lookup.call_count, 2)
+
+    def test_vehicle_expires_after_cache_timeout(self):
+        vehicle = make_vehicle(DEVICE_IMEI)
+        self.lookup.return_value.first.return_value = vehicle
+        self.assertIs(self.listener.get_cached_vehicle(DEVICE_IMEI), vehicle)
+
+        self.clock.return_value = 1000.0 + self.listener.cache_timeout - 1
+        self.assertIs(self.listener.get_cached_vehicle(DEVICE_IMEI), vehicle)
+        self.assertEqual(self.lookup.call_count, 1)
+
+        self.clock.return_value = 1000.0 + self.listener.cache_timeout + 1
+        self.listener.get_cached_vehicle(DEVICE_IMEI)
+        self.assertEqual(self.lookup.call_count, 2)
+
+    def test_least_recently_used_vehicle_is_evicted(self):
+        self.lookup.return_value.first.side_effect = lambda: make_vehicle(self.lookup.call_args[1]['imei__imei_number'])
+        with mock.patch.object(services, 'VEHICLE_CACHE_SIZE', 2):
+            self.listener.get_cached_vehicle("A")
+            self.listener.get_cached_vehicle("B")
+            self.listener.get_cached_vehicle("A")  # hit: A becomes the most recently used
+            self.assertEqual(list(self.listener.vehicle_cache), ["B", "A"])
+
+            self.listener.get_cached_vehicle("C")
+        self.assertEqual(list(self.listener.vehicle_cache), ["A", "C"])
+        self.assertEqual(self.lookup.call_count, 3)
+
+
+def make_latra_response(status_code, body):
+    """Streamed requests response whose raw.read honours the requested size"""
+    raw = io.BytesIO(body)
+    response = mock.MagicMock(status_code=status_code)
+    response.__enter__.return_value = response
+    response.raw.read.side_effect = lambda amt, decode_content=False: raw.read(amt)
+    return response
+
+
+class LatraPostTests(SimpleTestCase):
+    """post_latra_payload reads at most a bounded prefix of LATRA's reply"""
+
+    def setUp(self):
+        self.listener = GPSListener()
+        patcher = mock.patch.object(services, '_get_latra_session')
+        self.post = patcher.start().return_value.post
+        self.addCleanup(patcher.stop)
+
+    def post_reply(self, status_code, body):
+        self.post.return_value = make_latra_response(status_code, body)
+        return self.listener.post_latra_payload(DEVICE_IMEI, b"{}", 1)
+
+    def test_json_reply_is_decoded(self):
+        self.assertEqual(self.post_reply(200, b'{"status": "ok"}'), (True, {"status": "ok"}))
+        self.assertTrue(self.post.call_args[1]["stream"])
+
+    def test_non_json_reply_is_kept_raw(self):
+        self.assertEqual(self.post_reply(200, b"accepted"), (True, {"raw": "accepted", "truncated": False}))
+
+    def test_oversized_reply_is_truncated(self):
+        success, response = self.post_reply(200, b"x" * (services.LATRA_RESPONSE_BODY_LIMIT * 2))
+        self.assertTrue(success)
+        self.assertTrue(response["truncated"])
+        self.assertEqual(len(response["raw"]), services.LATRA_RESPONSE_BODY_LIMIT)
+
+    def test_error_body_is_bounded(self):
+        success, response = self.post_reply(500, b"<html>" + b"e" * (services.LATRA_ERROR_BODY_LIMIT * 4))
+        self.assertFalse(success)
+        self.assertTrue(response["error"].startswith("LATRA API returned status 500: <html>"))
+        self.assertLessEqual(len(response["error"]), services.LATRA_ERROR_BODY_LIMIT + 64)
+
+
+class LatraPayloadTests(SimpleTestCase):
+    """build_latra_payload takes item timestamps from the parser's epoch ms"""
+
+    def setUp(self):
+        self.listener = GPSListener()
+
+    def payload_timestamp(self, timestamp_ms):
+        record = self.listener.codec_8e_parser_bin(bytes.fromhex(CODEC_8_PACKET), DEVICE_IMEI)['records'][0]
+        record['timestamp_ms'] = timestamp_ms
+        body, item_count, error = self.listener.build_latra_payload(make_vehicle(DEVICE_IMEI), {'records': [record]})
+        self.assertIsNone(error)
+        self.assertEqual(item_count, 1)
+        return int(services.orjson.loads(body)['items'][0]['timestamp'])
+
+    def test_device_timestamp_is_sent_to_the_millisecond(self):
+        self.assertEqual(self.payload_timestamp(1755284729123), 1755284729123)
+
+    def test_out_of_range_timestamp_falls_back_to_now(self):
+        for timestamp_ms in (0, int(time.time() * 1000) + 2 * 24 * 60 * 60 * 1000):
+            self.assertAlmostEqual(self.payload_timestamp(timestamp_ms), time.time() * 1000, delta=60000)
@@ -85,6 +85,8 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': 'db',
         'PORT': '5432',
+        # Keep connections open between GPS listener batches instead of reconnecting per packet
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '300')),
     }
 }
 
@@ -140,6 +142,23 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 LATRA_API_URL = os.getenv('LATRA_API_URL')
 LATRA_API_TOKEN = os.getenv('LATRA_API_TOKEN')
 
+# Logging - GPS listener debug output is off unless GPS_LISTENER_LOG_LEVEL=DEBUG
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'gps_listener': {
+            'handlers': ['console'],
+            'level': os.getenv('GPS_LISTENER_LOG_LEVEL', 'INFO'),
+        },
+    },
+}
+
 # Login/Logout URLs
 LOGIN_URL = '/login/'
 LOGIN_REDIRECT_URL = '/dashboard/'